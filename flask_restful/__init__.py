@@ -1,18 +1,25 @@
 from __future__ import absolute_import
-from functools import wraps, partial
-from flask import request, url_for, current_app
+from functools import wraps, partial, update_wrapper
+from itertools import islice
+from flask import request, url_for, current_app, has_app_context
 from flask import abort as original_flask_abort
 from flask import make_response as original_flask_make_response
 from flask.views import MethodView
 from flask.signals import got_request_exception
 from werkzeug.datastructures import Headers
 from werkzeug.exceptions import HTTPException, MethodNotAllowed, NotFound, NotAcceptable, InternalServerError
+from werkzeug.http import http_date, is_resource_modified, quote_etag
 from werkzeug.wrappers import Response as ResponseBase
-from flask_restful.utils import http_status_message, unpack, OrderedDict
+from flask_restful.utils import http_status_message, unpack, OrderedDict, LRUCache
 from flask_restful.representations.json import output_json
+from flask_restful.compression import Compression
+from flask_restful.cache import store_response
 import sys
+import threading
 from types import MethodType
+from weakref import WeakValueDictionary
 import operator
+import six
 try:
     from collections.abc import Mapping
 except ImportError:
@@ -20,7 +27,8 @@ except ImportError:
 
 _PROPAGATE_EXCEPTIONS = 'PROPAGATE_EXCEPTIONS'
 
-__all__ = ('Api', 'Resource', 'marshal', 'marshal_with', 'marshal_with_field', 'abort')
+__all__ = ('Api', 'Resource', 'marshal', 'marshal_with', 'marshal_with_field', 'abort',
+           'CompiledSchema', 'MarshalledStream')
 
 
 def abort(http_status_code, **kwargs):
@@ -96,13 +104,35 @@ class Api(object):
     :param errors: A dictionary to define a custom response for each
         exception or error raised during a request
     :type errors: dict
+    :param compression: Compress responses with a content coding the client
+        accepts, either ``True`` for the defaults or a
+        :class:`~flask_restful.compression.Compression` instance
+    :type compression: bool or flask_restful.compression.Compression
+    :param etag: Give successful responses to GET and HEAD requests an ETag
+        hashed from their body if they have none, and answer conditional
+        requests for them with 304 Not Modified. ``'weak'`` makes the ETags
+        weak, which suits bodies that only vary in serialization, such as
+        :func:`marshal_with` output.
+    :type etag: bool or str
 
     """
 
+    #: Number of distinct Accept headers whose negotiated mediatype is cached
+    negotiation_cache_size = 128
+
+    #: Number of urls for which it is cached whether a 405 error belongs to
+    #: this api
+    error_route_cache_size = 512
+
+    _representations_version = 0
+
     def __init__(self, app=None, prefix='',
                  default_mediatype='application/json', decorators=None,
                  catch_all_404s=False, serve_challenge_on_401=False,
-                 url_part_order='bae', errors=None):
+                 url_part_order='bae', errors=None, compression=None,
+                 etag=False):
+        self._negotiation_cache = LRUCache(self.negotiation_cache_size)
+        self._error_route_cache = LRUCache(self.error_route_cache_size)
         self.representations = OrderedDict(DEFAULT_REPRESENTATIONS)
         self.urls = {}
         self.prefix = prefix
@@ -112,6 +142,8 @@ class Api(object):
         self.serve_challenge_on_401 = serve_challenge_on_401
         self.url_part_order = url_part_order
         self.errors = errors or {}
+        self.compression = Compression() if compression is True else compression or None
+        self.etag = etag
         self.blueprint_setup = None
         self.endpoints = set()
         self.resources = []
@@ -250,21 +282,52 @@ class Api(object):
 
         :return: bool
         """
+        # Flask has already matched the request; only match it again if
+        # neither the rule nor the routing error it found are known.
+        if getattr(request, 'url_rule', None) is not None:
+            return None
+        routing_exception = getattr(request, 'routing_exception', None)
+        if isinstance(routing_exception, MethodNotAllowed):
+            return self._owns_allowed_methods(None, routing_exception)
+        if isinstance(routing_exception, NotFound):
+            return self.catch_all_404s
+        if routing_exception is not None:
+            return None
+
         adapter = current_app.create_url_adapter(request)
 
         try:
             adapter.match()
         except MethodNotAllowed as e:
-            # Check if the other HTTP methods at this url would hit the Api
-            valid_route_method = e.valid_methods[0]
-            rule, _ = adapter.match(method=valid_route_method, return_rule=True)
-            return self.owns_endpoint(rule.endpoint)
+            return self._owns_allowed_methods(adapter, e)
         except NotFound:
             return self.catch_all_404s
         except:
             # Werkzeug throws other kinds of exceptions, such as Redirect
             pass
 
+    def _owns_allowed_methods(self, adapter, e):
+        """Checks if the other HTTP methods at the url of a request that
+        raised :exc:`MethodNotAllowed` would hit the Api. The answer is
+        cached per url, as long as no rules are added to the app.
+
+        :param adapter: the url adapter of the request, created if None
+        :param e: the :exc:`MethodNotAllowed` raised by matching the request
+        :return: bool
+        """
+        url_map = current_app.url_map
+        key = (request.host, request.script_root, request.path,
+               len(getattr(url_map, '_rules', ())))
+        owned = self._error_route_cache.get(key)
+        if owned is None:
+            if adapter is None:
+                adapter = current_app.create_url_adapter(request)
+            valid_route_method = e.valid_methods[0]
+            rule, _ = adapter.match(method=valid_route_method, return_rule=True)
+            owned = self.owns_endpoint(rule.endpoint)
+            self._error_route_cache.set(key, owned)
+        return owned
+
     def _has_fr_route(self):
         """Encapsulating the rules for whether the request was to a Flask endpoint"""
         # 404's, 405's, which might not have a url_rule
@@ -450,6 +513,10 @@ class Api(object):
 
         resource.mediatypes = self.mediatypes_method()  # Hacky
         resource.endpoint = endpoint
+        if (isinstance(resource, type) and issubclass(resource, Resource)
+                and resource.compose_decorators):
+            for method in resource.methods or ():
+                resource.compose_method_decorators(method.lower())
         resource_func = self.output(resource.as_view(endpoint, *resource_class_args,
             **resource_class_kwargs))
 
@@ -509,25 +576,69 @@ class Api(object):
         requested mediatype. If default_mediatype is None, a 406 Not
         Acceptable response will be sent as per RFC 2616 section 14.1
 
+        The response is tagged and answered conditionally if the api was
+        given ``etag``, and compressed if it was given ``compression``. It is
+        then cached if the view is decorated with
+        :func:`~flask_restful.cache.cached`.
+
         :param data: Python object containing response data to be transformed
         """
         default_mediatype = kwargs.pop('fallback_mediatype', None) or self.default_mediatype
-        mediatype = request.accept_mimetypes.best_match(
-            self.representations,
-            default=default_mediatype,
-        )
+        mediatype = self._negotiate(default_mediatype)
         if mediatype is None:
             raise NotAcceptable()
         if mediatype in self.representations:
             resp = self.representations[mediatype](data, *args, **kwargs)
             resp.headers['Content-Type'] = mediatype
-            return resp
         elif mediatype == 'text/plain':
             resp = original_flask_make_response(str(data), *args, **kwargs)
             resp.headers['Content-Type'] = 'text/plain'
-            return resp
         else:
             raise InternalServerError()
+        if self.etag and request.method in ('GET', 'HEAD'):
+            resp = self._make_conditional(resp)
+        if self.compression is not None:
+            resp = self.compression.compress(resp)
+        store_response(resp)
+        return resp
+
+    def _make_conditional(self, resp):
+        """Tags a successful response with an ETag hashed from its body,
+        unless it has one already, and turns it into a 304 Not Modified
+        response if the request's conditional headers match it."""
+        if resp.status_code != 200 or resp.is_streamed:
+            return resp
+        if 'ETag' not in resp.headers:
+            resp.add_etag(weak=self.etag == 'weak')
+        return resp.make_conditional(request)
+
+    @property
+    def representations(self):
+        """The representation transformers of this api, by mediatype"""
+        return self._representations
+
+    @representations.setter
+    def representations(self, representations):
+        self._representations = representations
+        self._representations_version += 1
+
+    def _negotiate(self, default_mediatype):
+        """Picks the best representation for the Accept header of the current
+        request. Clients mostly send the same few Accept headers, so the
+        result is cached per header; the cache is keyed on the representations
+        too, so registering a new one never returns a stale match.
+        """
+        representations = self.representations
+        key = (request.headers.get('Accept', ''), default_mediatype,
+               self._representations_version, len(representations))
+        mediatype = self._negotiation_cache.get(key, key)
+        if mediatype is key:
+            mediatype = request.accept_mimetypes.best_match(
+                representations,
+                default=default_mediatype,
+            )
+            self._negotiation_cache.set(key, mediatype)
+        return mediatype
 
     def mediatypes(self):
         """Returns a list of requested mediatypes sent in the Accept header"""
@@ -557,6 +668,7 @@ class Api(object):
         """
         def wrapper(func):
             self.representations[mediatype] = func
+            self._representations_version += 1
             return func
         return wrapper
 
@@ -583,25 +695,43 @@ class Resource(MethodView):
     """
     representations = None
     method_decorators = []
+    #: Whether :attr:`method_decorators` are applied once per class, see
+    #: :meth:`compose_method_decorators`, rather than to the bound method on
+    #: every request. Only turn it on if every decorator calls the function it
+    #: wraps before returning and doesn't use its ``__self__``.
+    compose_decorators = False
 
     def dispatch_request(self, *args, **kwargs):
 
         # Taken from flask
         #noinspection PyUnresolvedReferences
-        meth = getattr(self, request.method.lower(), None)
+        name = request.method.lower()
+        meth = getattr(self, name, None)
         if meth is None and request.method == 'HEAD':
             meth = getattr(self, 'get', None)
         assert meth is not None, 'Unimplemented method %r' % request.method
 
-        if isinstance(self.method_decorators, Mapping):
-            decorators = self.method_decorators.get(request.method.lower(), [])
-        else:
-            decorators = self.method_decorators
+        if request.method in ('GET', 'HEAD') and self._has_version():
+            # Checked inside the method decorators, so that the request is
+            # still authenticated before a 304 is sent
+            meth = partial(self._call_if_modified, meth)
+
+        instance_dict = getattr(self, '__dict__', {})
+        if (not self.compose_decorators or 'method_decorators' in instance_dict
+                or name in instance_dict):
+            # Decorators or methods set on this instance only can't be
+            # composed ahead of time
+            if isinstance(self.method_decorators, Mapping):
+                decorators = self.method_decorators.get(name, [])
+            else:
+                decorators = self.method_decorators
 
-        for decorator in decorators:
-            meth = decorator(meth)
+            for decorator in decorators:
+                meth = decorator(meth)
 
-        resp = meth(*args, **kwargs)
+            resp = meth(*args, **kwargs)
+        else:
+            resp = self.compose_method_decorators(name)(meth, args, kwargs)
 
         if isinstance(resp, ResponseBase):  # There may be a better way to test
             return resp
@@ -618,8 +748,149 @@ class Resource(MethodView):
 
         return resp
 
+    def get_etag(self, *args, **kwargs):
+        """Returns the ETag of the representation a GET or HEAD request
+        would get, or ``None``. Override this when a version of the resource
+        is cheaper to find than its representation: conditional requests
+        that match it are answered with 304 Not Modified without calling the
+        method, and other responses get it as their ETag.
+
+        Takes the same arguments as the method.
 
-def marshal(data, fields, envelope=None):
+        :return: The ETag, or an ``(etag, weak)`` tuple for a weak ETag
+        """
+        return None
+
+    def get_last_modified(self, *args, **kwargs):
+        """Returns when the resource was last modified, or ``None``. Used
+        like :meth:`get_etag`, for ``If-Modified-Since`` requests and the
+        ``Last-Modified`` header.
+
+        :rtype: datetime.datetime
+        """
+        return None
+
+    def _has_version(self):
+        cls = type(self)
+        return (cls.get_etag != Resource.get_etag
+                or cls.get_last_modified != Resource.get_last_modified)
+
+    def _call_if_modified(self, meth, *args, **kwargs):
+        etag, weak = self.get_etag(*args, **kwargs), False
+        if isinstance(etag, tuple):
+            etag, weak = etag
+        last_modified = self.get_last_modified(*args, **kwargs)
+        if etag is None and last_modified is None:
+            return meth(*args, **kwargs)
+
+        validators = Headers()
+        if etag is not None:
+            validators['ETag'] = quote_etag(etag, weak)
+        if last_modified is not None:
+            validators['Last-Modified'] = http_date(last_modified)
+
+        if not is_resource_modified(request.environ, etag=etag,
+                                    last_modified=last_modified):
+            return current_app.response_class(status=304, headers=validators)
+
+        resp = meth(*args, **kwargs)
+        if isinstance(resp, ResponseBase):
+            for header, value in validators.items():
+                resp.headers.setdefault(header, value)
+            return resp
+
+        data, code, headers = unpack(resp)
+        headers = Headers(headers)
+        for header, value in validators.items():
+            headers.setdefault(header, value)
+        return data, code, headers
+
+    @classmethod
+    def compose_method_decorators(cls, name):
+        """Returns the :attr:`method_decorators` for the method ``name``
+        applied once for this class, rather than to the bound method on
+        every request. The result is called with the bound method and its
+        positional and keyword arguments, and is cached until the class's
+        decorators change.
+
+        The decorators wrap a stand-in for the method, carrying its name,
+        docstring and attributes, which calls the bound method of the
+        request being dispatched. It has no ``__self__``, and only calls the
+        bound method until the decorated function returns. Used when
+        :attr:`compose_decorators` is set.
+
+        :param name: the lowercase name of the HTTP method, e.g. ``'get'``.
+            ``'head'`` falls back to the ``get`` method, but keeps its own
+            decorators.
+        """
+        decorators = cls.method_decorators
+        if isinstance(decorators, Mapping):
+            decorators = decorators.get(name, [])
+        decorators = tuple(decorators)
+
+        chains = cls.__dict__.get('_method_chains')
+        if chains is None:
+            chains = {}
+            setattr(cls, '_method_chains', chains)
+        chain = chains.get(name)
+        if chain is not None and chain[0] == decorators:
+            return chain[1]
+
+        if not decorators:
+            call = _call_method
+        else:
+            func = getattr(cls, name, None)
+            if func is None and name == 'head':
+                func = getattr(cls, 'get', None)
+            call = _compose_method(func, decorators)
+        chains[name] = (decorators, call)
+        return call
+
+
+def _call_method(meth, args, kwargs):
+    return meth(*args, **kwargs)
+
+
+def _compose_method(func, decorators):
+    """Applies ``decorators`` to a stand-in for ``func`` that calls the bound
+    method passed in for the current call, and returns a function invoking
+    the decorated stand-in with a given bound method."""
+    local = threading.local()
+
+    def method(*args, **kwargs):
+        return local.meth(*args, **kwargs)
+
+    if func is not None:
+        update_wrapper(method, getattr(func, '__func__', func))
+        # The stand-in takes the arguments of the bound method, not of func
+        method.__dict__.pop('__wrapped__', None)
+
+    decorated = method
+    for decorator in decorators:
+        decorated = decorator(decorated)
+
+    def call(meth, args, kwargs):
+        # Saved and restored so that a method may dispatch to another
+        # instance of the same resource
+        previous = getattr(local, 'meth', None)
+        local.meth = meth
+        try:
+            return decorated(*args, **kwargs)
+        finally:
+            local.meth = previous
+    return call
+
+
+def _mapping_type(ordered):
+    """Returns the mapping type marshalled records are built with. When
+    ``ordered`` is None this follows the ``RESTFUL_MARSHAL_ORDERED`` config
+    setting of the current app, which defaults to True."""
+    if ordered is None:
+        ordered = not has_app_context() or current_app.config.get('RESTFUL_MARSHAL_ORDERED', True)
+    return OrderedDict if ordered else dict
+
+
+def marshal(data, fields, envelope=None, batch=False, ordered=None):
     """Takes raw data (in the form of a dict, list, object) and a dict of
     fields to output and filters the data based on those fields.
 
@@ -628,6 +899,13 @@ def marshal(data, fields, envelope=None):
                    response output
     :param envelope: optional key that will be used to envelop the serialized
                      response
+    :param bool batch: marshal a list of records, or tabular data given by
+                       column, one field at a time. See
+                       :meth:`CompiledSchema.batch`
+    :param bool ordered: build :class:`~collections.OrderedDict` records if
+        True, or plain dicts (which are cheaper to build) if False. Defaults
+        to the ``RESTFUL_MARSHAL_ORDERED`` config setting, itself True. Has
+        no effect when ``fields`` is already compiled.
 
 
     >>> from flask_restful import fields, marshal
@@ -640,6 +918,10 @@ def marshal(data, fields, envelope=None):
     >>> marshal(data, mfields, envelope='data')
     OrderedDict([('data', OrderedDict([('a', 100)]))])
 
+    ``fields`` may also be a :class:`CompiledSchema`, as returned by
+    ``marshal.compile(fields)``, in which case the schema is not
+    re-interpreted for this call.
+
     """
 
     def make(cls):
@@ -647,14 +929,313 @@ def marshal(data, fields, envelope=None):
             return cls()
         return cls
 
-    if isinstance(data, (list, tuple)):
-        return (OrderedDict([(envelope, [marshal(d, fields) for d in data])])
-                if envelope else [marshal(d, fields) for d in data])
+    if isinstance(fields, CompiledSchema):
+        return fields(data, envelope, batch)
+
+    if batch or isinstance(data, (list, tuple)):
+        # Resolve the fields once for the whole list rather than once per item
+        return CompiledSchema(fields, ordered=ordered)(data, envelope, batch)
 
-    items = ((k, marshal(data, v) if isinstance(v, dict)
-              else make(v).output(k, data))
+    from flask_restful.fields import bind_ordered
+
+    mapping = _mapping_type(ordered)
+    ordered = mapping is OrderedDict
+    items = ((k, marshal(data, v, ordered=ordered) if isinstance(v, dict)
+              else bind_ordered(make(v), ordered)(k, data))
              for k, v in fields.items())
-    return OrderedDict([(envelope, OrderedDict(items))]) if envelope else OrderedDict(items)
+    return mapping([(envelope, mapping(items))]) if envelope else mapping(items)
+
+
+class CompiledSchema(object):
+    """A dict of fields resolved once into a flat marshalling plan. Field
+    classes are instantiated up front and nested dicts are compiled into
+    sub-schemas, so marshalling many objects against the same fields does
+    not re-walk the fields dict for every object.
+
+    Instances are callable with the same arguments as :func:`marshal`, and
+    can be passed anywhere :func:`marshal` accepts a dict of fields. They are
+    usually created with ``marshal.compile(fields)``.
+
+    >>> from flask_restful import fields, marshal
+    >>> schema = marshal.compile({ 'a': fields.Raw })
+    >>> schema([{ 'a': 100, 'b': 'foo' }, { 'a': 200 }])
+    [OrderedDict([('a', 100)]), OrderedDict([('a', 200)])]
+
+    The fields dict is read when the schema is compiled; later changes to
+    it are not picked up.
+
+    :param fields: a dict of whose keys will make up the final serialized
+                   response output
+    :param bool generate: If enabled, generate and compile a Python function
+        specialized for these fields instead of calling each field's
+        ``output`` method. The generated source is kept in :attr:`source`.
+    :param bool ordered: build :class:`~collections.OrderedDict` records if
+        True, or plain dicts if False. Defaults to the
+        ``RESTFUL_MARSHAL_ORDERED`` config setting, as read when the schema
+        is compiled.
+    """
+
+    def __init__(self, fields, generate=False, ordered=None):
+        self.fields = fields
+        self._mapping = _mapping_type(ordered)
+        self.ordered = self._mapping is OrderedDict
+        plan = []
+        for key, field in fields.items():
+            if isinstance(field, dict):
+                field = CompiledSchema(field, generate=generate, ordered=self.ordered)
+            elif isinstance(field, type):
+                field = field()
+            plan.append((key, field))
+        self.plan = tuple(plan)
+        from flask_restful import fields
+        self._outputs = tuple((key, fields.bind_ordered(field, self.ordered))
+                              for key, field in plan)
+        self.source = None
+        if generate:
+            self.source, self.marshal_one = _generate_marshaller(self)
+
+    def __call__(self, data, envelope=None, batch=False):
+        """Marshals ``data`` against the compiled fields.
+
+        :param data: the actual object(s) from which the fields are taken from
+        :param envelope: optional key that will be used to envelop the
+                         serialized response
+        :param bool batch: marshal ``data`` column by column, see
+                           :meth:`batch`
+        """
+        if isinstance(data, (list, tuple)) and any(isinstance(d, (list, tuple)) for d in data):
+            items = self._marshal_nested(data)
+        elif batch:
+            items = self.batch(data)
+        elif isinstance(data, (list, tuple)):
+            marshal_one = self.marshal_one
+            items = [marshal_one(d) for d in data]
+        else:
+            items = self.marshal_one(data)
+        return self._mapping([(envelope, items)]) if envelope else items
+
+    def _marshal_nested(self, data):
+        """Marshals a list that holds lists of records, keeping its shape."""
+        marshal_one = self.marshal_one
+        return [self._marshal_nested(d) if isinstance(d, (list, tuple)) else marshal_one(d)
+                for d in data]
+
+    def batch(self, data):
+        """Marshals many records one field at a time rather than one record
+        at a time: all the values for a field are pulled out first and then
+        formatted together (see :func:`fields.format_column`). The result is
+        the same list :meth:`__call__` returns for a list of records.
+
+        ``data`` may be a list of objects, or tabular data laid out by
+        column: a mapping of column names to equally long sequences, a
+        pandas ``DataFrame`` or a NumPy structured array. Columns are matched
+        to fields by the field's key (or ``attribute``). Fields that need a
+        whole record, such as :class:`~fields.Url` or fields with a dotted
+        or callable ``attribute``, get one built from the columns.
+
+        :param data: the records to marshal
+        :return: a list with one marshalled record per input record
+        """
+        from flask_restful import fields
+
+        if isinstance(data, (list, tuple)):
+            records, names, length = data, None, len(data)
+        else:
+            records = None
+            names = getattr(getattr(data, 'dtype', None), 'names', None)
+            if names is not None:  # NumPy structured array
+                length = len(data)
+            elif hasattr(data, 'columns'):  # pandas DataFrame
+                names, length = list(data.columns), len(data)
+            else:
+                names = list(data.keys())
+                length = len(data[names[0]]) if names else 0
+
+        keys = []
+        columns = []
+        for key, field in self.plan:
+            if isinstance(field, CompiledSchema):
+                column = field.batch(data)
+            elif fields._uses_standard_output(field):
+                path = key if field.attribute is None else field.attribute
+                if records is not None:
+                    accessor = fields.make_accessor(path)
+                    column = [accessor(record) for record in records]
+                elif path in names:
+                    column = data[path]
+                elif isinstance(path, six.string_types) and '.' not in path:
+                    column = [None] * length
+                else:
+                    records = self._records(data, names)
+                    accessor = fields.make_accessor(path)
+                    column = [accessor(record) for record in records]
+                column = fields.format_column(field, column)
+            else:
+                if records is None:
+                    records = self._records(data, names)
+                output = fields.bind_ordered(field, self.ordered)
+                column = [output(key, record) for record in records]
+            keys.append(key)
+            columns.append(column)
+
+        mapping = self._mapping
+        if not columns:
+            return [mapping() for _ in range(length)]
+        return [mapping(zip(keys, values)) for values in zip(*columns)]
+
+    @staticmethod
+    def _records(data, names):
+        """Rebuilds one dict per record from columnar ``data``."""
+        if hasattr(data, 'tolist') and hasattr(data, 'dtype'):
+            rows = data.tolist()
+        else:
+            rows = zip(*[data[name].tolist() if hasattr(data[name], 'tolist')
+                         else data[name] for name in names])
+        return [dict(zip(names, row)) for row in rows]
+
+    def marshal_one(self, obj):
+        """Marshals a single object, which is never treated as a list."""
+        return self._mapping([(key, output(key, obj)) for key, output in self._outputs])
+
+    def output(self, key, obj):
+        # Lets a compiled sub-schema take part in its parent's plan the
+        # same way a field does; nested dicts read from the parent object.
+        return self.marshal_one(obj)
+
+
+# Formatting applied inline by generated marshallers, keyed by the exact
+# field type; the second item says whether ValueError has to be wrapped in
+# a MarshallingException, as the field's own format method does.
+_INLINE_FORMATS = {
+    'Raw': ('{0}', False),
+    'String': ('_text_type({0})', True),
+    'Integer': ('int({0})', True),
+    'Float': ('float({0})', True),
+    'Boolean': ('bool({0})', False),
+}
+
+
+def _generate_marshaller(schema):
+    """Generates the source of a function that marshals a single object
+    against ``schema`` and compiles it. Lookups and formatting for the
+    built-in scalar fields are written out inline, which gives the same
+    result as calling ``field.output`` without the chain of calls behind it;
+    every other field is called as usual.
+
+    :return: a ``(source, function)`` tuple
+    """
+    from flask_restful import fields
+
+    namespace = {
+        'OrderedDict': OrderedDict,
+        'MarshallingException': fields.MarshallingException,
+        '_text_type': six.text_type,
+        '_lookup_errors': (IndexError, TypeError, KeyError),
+        '_is_indexable': fields._is_indexable,
+    }
+    inline_types = dict((getattr(fields, name), fmt)
+                        for name, fmt in _INLINE_FORMATS.items())
+    lines = ['def marshal_one(obj):',
+             '    indexable = _is_indexable(obj)']
+    items = []
+
+    for i, (key, field) in enumerate(schema.plan):
+        result = 'value%d' % i
+        items.append(('_key%d' % i, result))
+        namespace['_key%d' % i] = key
+
+        inline = inline_types.get(type(field))
+        path = key if inline is None or field.attribute is None else field.attribute
+        if inline is None or not isinstance(path, (six.string_types, int)):
+            namespace['_output%d' % i] = schema._outputs[i][1]
+            lines.append('    %s = _output%d(_key%d, obj)' % (result, i, i))
+            continue
+
+        source = 'obj'
+        keys = [path] if isinstance(path, int) else path.split('.')
+        for depth, part in enumerate(keys):
+            if depth == 0:
+                check = 'indexable'
+            else:
+                check = '_is_indexable(%s)' % source
+            lines.extend([
+                '    if %s:' % check,
+                '        try:',
+                '            %s = %s[%r]' % (result, source, part),
+                '        except _lookup_errors:',
+                '            %s = getattr(%s, %r, None)' % (result, source, part),
+                '    else:',
+                '        %s = getattr(%s, %r, None)' % (result, source, part),
+            ])
+            source = result
+
+        expression, wrap_errors = inline
+        namespace['_default%d' % i] = field.default
+        lines.extend([
+            '    if %s is None:' % result,
+            '        %s = _default%d' % (result, i),
+            '    else:',
+        ])
+        if wrap_errors:
+            lines.extend([
+                '        try:',
+                '            %s = %s' % (result, expression.format(result)),
+                '        except ValueError as error:',
+                '            raise MarshallingException(error)',
+            ])
+        else:
+            lines.append('        %s = %s' % (result, expression.format(result)))
+
+    if schema.ordered:
+        lines.append('    return OrderedDict([%s])'
+                     % ', '.join('(%s, %s)' % item for item in items))
+    else:
+        lines.append('    return {%s}' % ', '.join('%s: %s' % item for item in items))
+    source = '\n'.join(lines) + '\n'
+    exec(compile(source, '<flask_restful marshaller>', 'exec'), namespace)
+    return source, namespace['marshal_one']
+
+
+_generated_schemas = WeakValueDictionary()
+
+
+def _fields_snapshot(fields):
+    """Returns the items of a fields dict, and of the dicts nested in it, as
+    tuples that compare equal for as long as none of them is changed."""
+    return tuple((key, _fields_snapshot(field) if isinstance(field, dict) else field)
+                 for key, field in fields.items())
+
+
+def _compile(fields, generate=False, ordered=None):
+    """Compiles a dict of fields into a :class:`CompiledSchema`.
+
+    With ``generate=True`` the schema gets a generated marshalling function
+    (see :func:`_generate_marshaller`). Generated schemas are cached per
+    fields dict and ``ordered`` setting, so compiling the same dict again is
+    cheap for as long as the schema is in use. The dict is compiled anew if
+    it was changed since.
+
+    :param fields: a dict of whose keys will make up the final serialized
+                   response output
+    :param bool generate: Whether to generate a specialized marshaller
+    :param bool ordered: Whether to build ordered records, see
+                         :class:`CompiledSchema`
+    """
+    if isinstance(fields, CompiledSchema):
+        return fields
+    if not generate:
+        return CompiledSchema(fields, ordered=ordered)
+    ordered = _mapping_type(ordered) is OrderedDict
+    snapshot = _fields_snapshot(fields)
+    schema = _generated_schemas.get((id(fields), ordered))
+    if schema is None or schema.fields is not fields or schema._snapshot != snapshot:
+        schema = CompiledSchema(fields, generate=True, ordered=ordered)
+        schema._snapshot = snapshot
+        _generated_schemas[(id(fields), ordered)] = schema
+    return schema
+
+
+marshal.compile = _compile
 
 
 class marshal_with(object):
@@ -678,29 +1259,93 @@ class marshal_with(object):
     >>> get()
     OrderedDict([('data', OrderedDict([('a', 100)]))])
 
+    With ``stream=True`` the decorated method may return any iterable of
+    records, such as a generator. Records are then marshalled one at a time
+    as the response is sent (see :class:`MarshalledStream`).
+
     see :meth:`flask_restful.marshal`
     """
-    def __init__(self, fields, envelope=None):
+    def __init__(self, fields, envelope=None, batch=False, stream=False, ordered=None):
         """
         :param fields: a dict of whose keys will make up the final
-                       serialized response output
+                       serialized response output, or a
+                       :class:`CompiledSchema`
         :param envelope: optional key that will be used to envelop the serialized
                          response
+        :param bool batch: marshal the returned records one field at a time,
+                           see :meth:`CompiledSchema.batch`
+        :param bool stream: marshal and send the returned records lazily
+                            instead of building the whole list up front
+        :param bool ordered: build ordered records, see :func:`marshal`
         """
         self.fields = fields
         self.envelope = envelope
+        self.batch = batch
+        self.stream = stream
+        self.ordered = ordered
+        self.schema = None
 
     def __call__(self, f):
         @wraps(f)
         def wrapper(*args, **kwargs):
             resp = f(*args, **kwargs)
+            # Compiled on first use so the fields dict may still be filled
+            # in after the decorator has been applied.
+            if self.schema is None:
+                self.schema = marshal.compile(self.fields, ordered=self.ordered)
             if isinstance(resp, tuple):
                 data, code, headers = unpack(resp)
-                return marshal(data, self.fields, self.envelope), code, headers
+                return self._marshal(data), code, headers
             else:
-                return marshal(resp, self.fields, self.envelope)
+                return self._marshal(resp)
         return wrapper
 
+    def _marshal(self, data):
+        if self.stream:
+            return MarshalledStream(data, self.schema, self.envelope, self.batch)
+        return self.schema(data, self.envelope, self.batch)
+
+
+class MarshalledStream(object):
+    """An iterable of records that are marshalled only as they are consumed,
+    as returned by :class:`marshal_with` with ``stream=True``.
+
+    Representations that support streaming, like the default JSON one,
+    send it as a chunked response so that the full list of records never
+    has to be held in memory. The request context stays available while
+    the records are produced.
+
+    :param iterable: the records to marshal, for instance a generator
+    :param schema: a dict of fields or a :class:`CompiledSchema`
+    :param envelope: optional key that the streamed list should be
+                     enveloped in
+    :param bool batch: marshal the records one field at a time, in groups of
+                       :attr:`batch_size`
+    """
+
+    #: Number of records marshalled together when ``batch`` is enabled
+    batch_size = 1000
+
+    def __init__(self, iterable, schema, envelope=None, batch=False):
+        self.iterable = iterable
+        self.schema = marshal.compile(schema)
+        self.envelope = envelope
+        self.batch = batch
+
+    def __iter__(self):
+        iterator = iter(self.iterable)
+        if not self.batch:
+            marshal_one = self.schema.marshal_one
+            for record in iterator:
+                yield marshal_one(record)
+            return
+        while True:
+            records = list(islice(iterator, self.batch_size))
+            if not records:
+                return
+            for item in self.schema.batch(records):
+                yield item
+
 
 class marshal_with_field(object):
     """
@@ -0,0 +1,356 @@
+from __future__ import absolute_import
+from functools import wraps
+from hashlib import sha1
+import errno
+import json
+import os
+import tempfile
+import threading
+import time
+
+from flask import after_this_request, current_app, g, request
+from werkzeug.wrappers import Response as ResponseBase
+import six
+
+from flask_restful.utils import OrderedDict
+
+__all__ = ('MemoryCache', 'FileCache', 'ResponseCache', 'cached', 'invalidate',
+           'store_response', 'default_cache')
+
+
+class MemoryCache(object):
+    """A cache backend keeping values in the memory of this process. Once the
+    values add up to more than ``max_size`` bytes, the least recently used
+    ones are dropped.
+
+    Like every backend, it maps string keys to bytes values, each with an
+    optional time to live in seconds.
+
+    :param int max_size: the maximum number of bytes of values to keep
+    """
+
+    def __init__(self, max_size=64 * 1024 * 1024):
+        self.max_size = max_size
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns the value for ``key``, or ``None`` if it is missing or has
+        expired."""
+        with self._lock:
+            try:
+                expires, value = self._entries.pop(key)
+            except KeyError:
+                return None
+            if expires is not None and expires <= time.time():
+                self.size -= len(value)
+                return None
+            self._entries[key] = expires, value
+            return value
+
+    def set(self, key, value, ttl=None):
+        """Stores ``value`` for ``key``, for ``ttl`` seconds or until it is
+        evicted."""
+        with self._lock:
+            self._set(key, value, ttl)
+
+    def add(self, key, value, ttl=None):
+        """Stores ``value`` for ``key`` only if it has no value yet.
+
+        :return: whether the value was stored
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > time.time()):
+                return False
+            self._set(key, value, ttl)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.size -= len(entry[1])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _set(self, key, value, ttl):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[1])
+        if len(value) > self.max_size:
+            return
+        self._entries[key] = None if ttl is None else time.time() + ttl, value
+        self.size += len(value)
+        while self.size > self.max_size:
+            self.size -= len(self._entries.popitem(last=False)[1][1])
+
+
+class FileCache(object):
+    """A cache backend keeping values in files in ``directory``, which lets
+    the worker processes of a server share them. Point it at a directory
+    only the application can write to.
+
+    :param str directory: the directory to keep the files in, created if
+        missing
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        try:
+            os.makedirs(directory)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+
+    def _path(self, key):
+        return os.path.join(self.directory, sha1(key.encode('utf-8')).hexdigest())
+
+    def _read(self, path):
+        try:
+            with open(path, 'rb') as f:
+                expires, _, value = f.read().partition(b'\n')
+        except (IOError, OSError):
+            return None
+        if expires and float(expires) <= time.time():
+            return None
+        return value
+
+    def _dump(self, value, ttl):
+        expires = b'' if ttl is None else repr(time.time() + ttl).encode('ascii')
+        return expires + b'\n' + value
+
+    def get(self, key):
+        return self._read(self._path(key))
+
+    def set(self, key, value, ttl=None):
+        # Written to a temporary file and moved in place, so readers never
+        # see a partly written value
+        fd, temp = tempfile.mkstemp(dir=self.directory, prefix='.')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self._dump(value, ttl))
+            getattr(os, 'replace', os.rename)(temp, self._path(key))
+        except Exception:
+            os.remove(temp)
+            raise
+
+    def add(self, key, value, ttl=None):
+        path = self._path(key)
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except OSError as e:
+                if e.errno != errno.EEXIST:
+                    raise
+                if self._read(path) is not None:
+                    return False
+                # Expired, so it can be replaced
+                self.delete(key)
+                continue
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self._dump(value, ttl))
+            return True
+        return False
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+
+def _hash(*parts):
+    dumped = json.dumps(parts, sort_keys=True, default=six.text_type)
+    return sha1(dumped.encode('utf-8')).hexdigest()
+
+
+class ResponseCache(object):
+    """Caches serialized responses in a backend.
+
+    :param backend: the cache backend, a :class:`MemoryCache` by default
+    :param int lock_timeout: how many seconds other requests for a response
+        wait for the request building it, at most
+    """
+
+    #: The status codes of responses that are cached
+    cacheable_status_codes = frozenset([200])
+
+    def __init__(self, backend=None, lock_timeout=10):
+        self.backend = MemoryCache() if backend is None else backend
+        self.lock_timeout = lock_timeout
+
+    def cached(self, ttl=300, vary=('Accept',)):
+        """Returns a decorator caching the responses of a resource method, or
+        of a view, for ``ttl`` seconds. See :func:`cached`."""
+        vary = tuple(vary)
+
+        def decorator(f):
+            @wraps(f)
+            def wrapper(*args, **kwargs):
+                if request.method not in ('GET', 'HEAD'):
+                    return f(*args, **kwargs)
+                return self._respond(f, args, kwargs, ttl, vary)
+            return wrapper
+        return decorator
+
+    def invalidate(self, endpoint):
+        """Drops the cached responses of ``endpoint``.
+
+        :param str endpoint: the endpoint, as in :attr:`flask.Request.endpoint`
+        """
+        key = self._generation_key(endpoint)
+        generation = int(self.backend.get(key) or 0) + 1
+        self.backend.set(key, str(generation).encode('ascii'))
+
+    def clear(self):
+        """Drops every cached response."""
+        self.backend.clear()
+
+    def _generation_key(self, endpoint):
+        return 'flask_restful:generation:%s' % endpoint
+
+    def _base_key(self):
+        # The generation is read for every lookup, so an LRU backend only
+        # evicts it after all the responses it was read for
+        generation = int(self.backend.get(self._generation_key(request.endpoint)) or 0)
+        return 'flask_restful:%s:%s' % (request.endpoint, _hash(
+            generation, request.view_args,
+            sorted(request.args.items(multi=True))))
+
+    def _key(self, base_key, headers):
+        return '%s:%s' % (base_key, _hash([request.headers.get(h) for h in headers]))
+
+    def _lookup(self, base_key):
+        headers = self.backend.get(base_key + ':vary')
+        if headers is None:
+            return None
+        entry = self.backend.get(self._key(base_key, json.loads(headers.decode('utf-8'))))
+        if entry is None:
+            return None
+        meta, _, body = entry.partition(b'\n')
+        status, headers = json.loads(meta.decode('utf-8'))
+        resp = current_app.response_class(body, status=status, headers=headers)
+        return resp.make_conditional(request)
+
+    def _respond(self, f, args, kwargs, ttl, vary):
+        base_key = self._base_key()
+        resp = self._lookup(base_key)
+        if resp is not None:
+            return resp
+
+        # Only one request builds a missing response; the others wait for it
+        lock_key = base_key + ':lock'
+        deadline = time.time() + self.lock_timeout
+        locked = self.backend.add(lock_key, b'1', self.lock_timeout)
+        while not locked and time.time() < deadline:
+            time.sleep(0.01)
+            resp = self._lookup(base_key)
+            if resp is not None:
+                return resp
+            locked = self.backend.add(lock_key, b'1', self.lock_timeout)
+
+        # Methods of resources return data that is only serialized later,
+        # by Api.make_response, which then stores the response. What other
+        # views return is made into a response by Flask, and stored then.
+        pending = g._flask_restful_cache = (self, base_key, ttl, vary,
+                                            lock_key if locked else None)
+
+        @after_this_request
+        def store(resp):
+            if g.get('_flask_restful_cache') is pending:
+                store_response(resp)
+            return resp
+
+        try:
+            resp = f(*args, **kwargs)
+        except Exception:
+            self._release(g.pop('_flask_restful_cache', None))
+            raise
+        if isinstance(resp, ResponseBase):
+            store_response(resp)
+        return resp
+
+    def _release(self, pending):
+        if pending is not None and pending[4] is not None:
+            self.backend.delete(pending[4])
+
+    def _store(self, resp, base_key, ttl, vary):
+        if (resp.status_code not in self.cacheable_status_codes or resp.is_streamed
+                or 'Set-Cookie' in resp.headers or '*' in resp.vary):
+            return
+        # The response also varies on the headers it says it does, such as
+        # Accept-Encoding when it was compressed
+        headers = sorted(set(h.title() for h in vary) | set(h.title() for h in resp.vary))
+        entry = json.dumps([resp.status_code, list(resp.headers.items())])
+        self.backend.set(base_key + ':vary', json.dumps(headers).encode('utf-8'), ttl)
+        self.backend.set(self._key(base_key, headers),
+                         entry.encode('utf-8') + b'\n' + resp.get_data(), ttl)
+
+
+def store_response(resp):
+    """Caches ``resp`` if it is the response to a request to a view decorated
+    with :func:`cached`.  Called by :meth:`Api.make_response
+    <flask_restful.Api.make_response>` with the response it made, so that
+    what is cached is the serialized response.
+
+    :param resp: the response
+    :type resp: flask.Response
+    """
+    pending = g.pop('_flask_restful_cache', None)
+    if pending is not None:
+        cache, base_key, ttl, vary = pending[:4]
+        try:
+            cache._store(resp, base_key, ttl, vary)
+        finally:
+            cache._release(pending)
+
+
+#: The response cache used by :func:`cached` and :func:`invalidate` when
+#: they are not given one
+default_cache = ResponseCache()
+
+
+def cached(ttl=300, vary=('Accept',), cache=None):
+    """Caches the responses to GET and HEAD requests made to a resource for
+    ``ttl`` seconds, keyed on the endpoint, view arguments, query string and
+    the values of the ``vary`` request headers, as well as any headers in the
+    ``Vary`` header of the response. What is cached is the serialized
+    response made by :meth:`Api.make_response
+    <flask_restful.Api.make_response>`, so cached responses are sent without
+    calling the method or serializing its output. Only ``200 OK`` responses
+    without cookies are cached.
+
+    Use it as one of the ``method_decorators`` of a resource, as one of the
+    ``decorators`` of an :class:`~flask_restful.Api`, or on a method::
+
+        class Todo(Resource):
+            method_decorators = {'get': [cached(ttl=60, vary=['Accept', 'Authorization'])]}
+
+    Add any header a response depends on, such as ``Authorization``, to
+    ``vary``.
+
+    :param int ttl: how many seconds responses are cached for
+    :param vary: the request headers responses depend on
+    :param cache: the :class:`ResponseCache` to use, :data:`default_cache` by
+        default
+    """
+    return (cache or default_cache).cached(ttl, vary)
+
+
+def invalidate(endpoint, cache=None):
+    """Drops the cached responses of ``endpoint``, see
+    :meth:`ResponseCache.invalidate`."""
+    (cache or default_cache).invalidate(endpoint)
@@ -0,0 +1,285 @@
+from __future__ import absolute_import
+import threading
+import warnings
+import zlib
+
+from flask import request
+import six
+
+from flask_restful.utils import OrderedDict, LRUCache
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+#: The mediatypes compressed by default
+COMPRESSIBLE_MEDIATYPES = (
+    'application/json',
+    'application/x-ndjson',
+    'application/xml',
+    'text/csv',
+    'text/html',
+    'text/plain',
+)
+
+
+class _ZlibCompressor(object):
+    """Adds :meth:`flush_chunk` to a :func:`zlib.compressobj`."""
+
+    def __init__(self, compressor):
+        self.compressor = compressor
+
+    def compress(self, data):
+        return self.compressor.compress(data)
+
+    def flush_chunk(self):
+        return self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def flush(self):
+        return self.compressor.flush()
+
+
+def gzip_compressor(level):
+    """Builds a ``gzip`` compressor using :mod:`zlib`, at ``level`` 6 by
+    default."""
+    return _ZlibCompressor(zlib.compressobj(6 if level is None else level, zlib.DEFLATED,
+                                            16 + zlib.MAX_WBITS))
+
+
+def deflate_compressor(level):
+    """Builds a ``deflate`` (zlib format) compressor using :mod:`zlib`, at
+    ``level`` 6 by default."""
+    return _ZlibCompressor(zlib.compressobj(6 if level is None else level, zlib.DEFLATED,
+                                            zlib.MAX_WBITS))
+
+
+class _BrotliCompressor(object):
+    """Gives a brotli compressor the interface of a zlib one."""
+
+    def __init__(self, compressor):
+        self.compressor = compressor
+
+    def compress(self, data):
+        return self.compressor.process(data)
+
+    def flush_chunk(self):
+        return self.compressor.flush()
+
+    def flush(self):
+        return self.compressor.finish()
+
+
+def brotli_compressor(level):
+    """Builds a ``br`` compressor using :mod:`brotli` or :mod:`brotlicffi`,
+    at quality 4 by default, which suits responses made on the fly."""
+    try:
+        import brotli
+    except ImportError:
+        import brotlicffi as brotli
+
+    return _BrotliCompressor(brotli.Compressor(quality=4 if level is None else level))
+
+
+class _ZstdCompressor(object):
+    """Gives a zstandard compressor the interface of a zlib one."""
+
+    def __init__(self, compressor, flush_block):
+        self.compressor = compressor
+        self.flush_block = flush_block
+
+    def compress(self, data):
+        return self.compressor.compress(data)
+
+    def flush_chunk(self):
+        return self.compressor.flush(self.flush_block)
+
+    def flush(self):
+        return self.compressor.flush()
+
+
+def zstd_compressor(level):
+    """Builds a ``zstd`` compressor using :mod:`zstandard`, at ``level`` 3
+    by default."""
+    import zstandard
+
+    compressor = zstandard.ZstdCompressor(level=3 if level is None else level)
+    return _ZstdCompressor(compressor.compressobj(), zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+
+#: The content codings that can be used for compression, mapped to a
+#: factory taking the compression level (``None`` for the default) and
+#: returning an object with the ``compress`` and ``flush`` methods of
+#: :func:`zlib.compressobj`, and optionally a ``flush_chunk`` method
+#: returning what it buffered so far, as ``flush(zlib.Z_SYNC_FLUSH)`` does.
+#: It is called after each chunk of a streamed response so that clients
+#: get every chunk as soon as it is sent.  Factories raise
+#: :exc:`ImportError` if the library they use is not installed.  When a client accepts several codings
+#: equally, the first one in this order is used.
+ENCODINGS = OrderedDict([
+    ('br', brotli_compressor),
+    ('zstd', zstd_compressor),
+    ('gzip', gzip_compressor),
+    ('deflate', deflate_compressor),
+])
+
+
+class Compression(object):
+    """Compresses the responses made by :meth:`Api.make_response
+    <flask_restful.Api.make_response>` with a content coding the client
+    accepts.  Pass it as the ``compression`` argument of
+    :class:`~flask_restful.Api`. ::
+
+        api = Api(app, compression=Compression(min_size=4096))
+
+    :param encodings: The content codings to use, in order of preference.
+        Defaults to every coding in :data:`ENCODINGS` that can be used.
+    :type encodings: list
+    :param level: The compression level, or a dict of levels by content
+        coding. Each coding has its own default.
+    :param int min_size: Bodies smaller than this many bytes are sent
+        uncompressed
+    :param mediatypes: The mediatypes to compress, or a dict mapping them to
+        the minimum size of their bodies, overriding ``min_size``
+    :param bool stream: Whether to compress streamed responses, chunk by
+        chunk as they are sent
+    """
+
+    #: Number of distinct Accept-Encoding headers whose negotiated content
+    #: coding is cached
+    negotiation_cache_size = 128
+
+    def __init__(self, encodings=None, level=None, min_size=1024,
+                 mediatypes=COMPRESSIBLE_MEDIATYPES, stream=True):
+        if isinstance(level, Mapping):
+            self.levels = dict(level)
+        else:
+            self.levels = dict.fromkeys(ENCODINGS, level)
+
+        self.encodings = []
+        for name in (ENCODINGS if encodings is None else encodings):
+            if name not in ENCODINGS:
+                raise ValueError('Unknown content coding %r' % (name,))
+            try:
+                ENCODINGS[name](self.levels.get(name))
+            except ImportError:
+                if encodings is not None:
+                    warnings.warn('The %s content coding is not installed, '
+                                  'responses will not use it' % name)
+            else:
+                self.encodings.append(name)
+
+        self.min_size = min_size
+        if isinstance(mediatypes, Mapping):
+            self.mediatypes = dict(mediatypes)
+        else:
+            self.mediatypes = dict.fromkeys(mediatypes, min_size)
+        self.stream = stream
+
+        self._negotiation_cache = LRUCache(self.negotiation_cache_size)
+        self._metrics_lock = threading.Lock()
+        # Responses, bytes in and bytes out, by content coding
+        self._metrics = dict((name, [0, 0, 0]) for name in self.encodings)
+
+    def negotiate(self):
+        """Picks the content coding to compress the response to the current
+        request with, or ``None`` if the client accepts none of them.
+
+        :rtype: str
+        """
+        header = request.headers.get('Accept-Encoding', '')
+        if not header:
+            return None
+        encoding = self._negotiation_cache.get(header, header)
+        if encoding is header:
+            encoding = request.accept_encodings.best_match(self.encodings)
+            self._negotiation_cache.set(header, encoding)
+        return encoding
+
+    def compress(self, response):
+        """Compresses ``response`` in place if its mediatype and size call for
+        it and the client accepts one of the content codings.  Strong ETags
+        are made weak, as the body no longer matches them byte for byte.
+
+        :param response: The response to compress
+        :type response: flask.Response
+        :return: the response
+        """
+        if (response.status_code < 200 or response.status_code in (204, 304)
+                or 'Content-Encoding' in response.headers):
+            return response
+        min_size = self.mediatypes.get(response.mimetype)
+        if min_size is None:
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = self.negotiate()
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            if not self.stream:
+                return response
+            response.response = self._compress_stream(
+                response.iter_encoded(), self._compressor(encoding), encoding)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < min_size:
+                return response
+            compressor = self._compressor(encoding)
+            compressed = compressor.compress(data) + compressor.flush()
+            if len(compressed) >= len(data):
+                return response
+            response.set_data(compressed)
+            self._record(encoding, len(data), len(compressed))
+
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag is not None and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    def _compressor(self, encoding):
+        return ENCODINGS[encoding](self.levels.get(encoding))
+
+    def _compress_stream(self, chunks, compressor, encoding):
+        flush_chunk = getattr(compressor, 'flush_chunk', None)
+        size = compressed_size = 0
+        for chunk in chunks:
+            size += len(chunk)
+            compressed = compressor.compress(chunk)
+            if flush_chunk is not None:
+                compressed += flush_chunk()
+            if compressed:
+                compressed_size += len(compressed)
+                yield compressed
+        compressed = compressor.flush()
+        compressed_size += len(compressed)
+        self._record(encoding, size, compressed_size)
+        yield compressed
+
+    def _record(self, encoding, size, compressed_size):
+        with self._metrics_lock:
+            metrics = self._metrics[encoding]
+            metrics[0] += 1
+            metrics[1] += size
+            metrics[2] += compressed_size
+
+    def metrics(self):
+        """Returns, for each content coding, its level and how many
+        responses it has compressed, from how many bytes to how many, and
+        the resulting compression ratio (``None`` until it compressed any).
+        Streamed responses are counted once they have been sent.
+
+        :rtype: dict
+        """
+        with self._metrics_lock:
+            metrics = dict((name, list(counts)) for name, counts in six.iteritems(self._metrics))
+        return dict((name, {
+            'level': self.levels.get(name),
+            'responses': responses,
+            'bytes_in': size,
+            'bytes_out': compressed_size,
+            'ratio': float(size) / compressed_size if compressed_size else None,
+        }) for name, (responses, size, compressed_size) in six.iteritems(metrics))
@@ -1,13 +1,14 @@
-from calendar import timegm
 from decimal import Decimal as MyDecimal, ROUND_HALF_EVEN
-from email.utils import formatdate
+from functools import partial
+from operator import itemgetter
 import six
 try:
     from urlparse import urlparse, urlunparse
 except ImportError:
     # python3
     from urllib.parse import urlparse, urlunparse
-from flask_restful import marshal
+from flask_restful import marshal, _mapping_type
+from flask_restful.utils import OrderedDict
 from flask import url_for, request
 
 __all__ = ["String", "FormattedString", "Url", "DateTime", "Float",
@@ -30,29 +31,95 @@ def is_indexable_but_not_string(obj):
     return not hasattr(obj, "strip") and hasattr(obj, "__iter__")
 
 
-def get_value(key, obj, default=None):
-    """Helper for pulling a keyed value off various types of objects"""
+_LOOKUP_ERRORS = (IndexError, TypeError, KeyError)
+
+# Whether instances of a type should be looked up by index before falling
+# back to getattr, as decided by is_indexable_but_not_string. Types that
+# resolve attributes dynamically are never cached since their instances may
+# answer differently from one another.
+_indexable_types = {
+    dict: True,
+    OrderedDict: True,
+    list: True,
+    tuple: True,
+    six.text_type: False,
+    six.binary_type: False,
+    type(None): False,
+}
+_slot_wrapper = type(object.__getattribute__)
+_MAX_INDEXABLE_TYPES = 1024
+
+
+def _is_indexable(obj):
+    cls = type(obj)
+    indexable = _indexable_types.get(cls)
+    if indexable is None:
+        indexable = is_indexable_but_not_string(obj)
+        if (not hasattr(cls, '__getattr__')
+                and isinstance(cls.__getattribute__, _slot_wrapper)
+                and len(_indexable_types) < _MAX_INDEXABLE_TYPES):
+            _indexable_types[cls] = indexable
+    return indexable
+
+
+def make_accessor(key):
+    """Builds a function that pulls a keyed value off various types of
+    objects, as :func:`get_value` does. The key is parsed once, so the
+    returned ``accessor(obj, default=None)`` can be reused cheaply.
+
+    :param key: An integer index, a (dotted) key or attribute name, or a
+        callable that takes the object and returns the value
+    """
     if isinstance(key, int):
-        return _get_value_for_key(key, obj, default)
+        keys = (key,)
     elif callable(key):
-        return key(obj)
+        return lambda obj, default=None: key(obj)
     else:
-        return _get_value_for_keys(key.split('.'), obj, default)
+        keys = tuple(key.split('.'))
 
+    hops = tuple((part, itemgetter(part)) for part in keys)
 
-def _get_value_for_keys(keys, obj, default):
-    if len(keys) == 1:
-        return _get_value_for_key(keys[0], obj, default)
+    if len(hops) == 1:
+        ((part, getitem),) = hops
+
+        def accessor(obj, default=None):
+            if _is_indexable(obj):
+                try:
+                    return getitem(obj)
+                except _LOOKUP_ERRORS:
+                    pass
+            return getattr(obj, part, default)
     else:
-        return _get_value_for_keys(
-            keys[1:], _get_value_for_key(keys[0], obj, default), default)
+        def accessor(obj, default=None):
+            for part, getitem in hops:
+                if _is_indexable(obj):
+                    try:
+                        obj = getitem(obj)
+                        continue
+                    except _LOOKUP_ERRORS:
+                        pass
+                obj = getattr(obj, part, default)
+            return obj
+
+    return accessor
+
+
+def get_value(key, obj, default=None):
+    """Helper for pulling a keyed value off various types of objects"""
+    if isinstance(key, int):
+        return _get_value_for_key(key, obj, default)
+    elif callable(key):
+        return key(obj)
+    for part in key.split('.'):
+        obj = _get_value_for_key(part, obj, default)
+    return obj
 
 
 def _get_value_for_key(key, obj, default):
-    if is_indexable_but_not_string(obj):
+    if _is_indexable(obj):
         try:
             return obj[key]
-        except (IndexError, TypeError, KeyError):
+        except _LOOKUP_ERRORS:
             pass
     return getattr(obj, key, default)
 
@@ -85,10 +152,40 @@ class Raw(object):
         than the publicly named value.
     """
 
+    # Fields are created once per schema but can be numerous, so the built-in
+    # ones keep their attributes in slots; subclasses that do not declare
+    # ``__slots__`` themselves get an instance ``__dict__`` as usual.
+    __slots__ = ('default', '_attribute', '_accessor')
+
     def __init__(self, default=None, attribute=None):
         self.attribute = attribute
         self.default = default
 
+    @property
+    def attribute(self):
+        return self._attribute
+
+    @attribute.setter
+    def attribute(self, attribute):
+        self._attribute = attribute
+        self._accessor = None if attribute is None else make_accessor(attribute)
+
+    def _lookup(self, key, obj):
+        """Pulls the value for :attr:`attribute` off ``obj`` through a
+        precomputed accessor if it is set, and for ``key`` otherwise. The key
+        changes from call to call for list items and fields shared by several
+        keys, so it is looked up directly rather than through an accessor."""
+        try:
+            accessor = self._accessor
+        except AttributeError:
+            # Subclasses that skip Raw.__init__ or set attribute as a plain
+            # class or instance attribute
+            attribute = self.attribute
+            accessor = None if attribute is None else make_accessor(attribute)
+        if accessor is None:
+            return get_value(key, obj)
+        return accessor(obj)
+
     def format(self, value):
         """Formats a field's value. No-op by default - field classes that
         modify how the value of existing object keys should be presented should
@@ -115,7 +212,7 @@ class Raw(object):
         :exception MarshallingException: In case of formatting problem
         """
 
-        value = get_value(key if self.attribute is None else self.attribute, obj)
+        value = self._lookup(key, obj)
 
         if value is None:
             return self.default
@@ -136,20 +233,46 @@ class Nested(Raw):
         null)
     """
 
+    __slots__ = ('nested', 'allow_null', '_schemas')
+
     def __init__(self, nested, allow_null=False, **kwargs):
         self.nested = nested
         self.allow_null = allow_null
+        self._schemas = {}
         super(Nested, self).__init__(**kwargs)
 
-    def output(self, key, obj):
-        value = get_value(key if self.attribute is None else self.attribute, obj)
+    @property
+    def schema(self):
+        """The nested fields as a :class:`~flask_restful.CompiledSchema`,
+        compiled on first use so self-referencing field dicts still work."""
+        return self.schema_for(None)
+
+    def schema_for(self, ordered):
+        """Returns :attr:`schema` building :class:`~collections.OrderedDict`
+        records if ``ordered`` is True or plain dicts if it is False, as set
+        on the schema this field is part of. If None, this follows the
+        ``RESTFUL_MARSHAL_ORDERED`` config setting of the current app.
+
+        :param bool ordered: whether records are ordered
+        """
+        ordered = _mapping_type(ordered) is OrderedDict
+        schemas = getattr(self, '_schemas', None)
+        if schemas is None:
+            schemas = self._schemas = {}
+        schema = schemas.get(ordered)
+        if schema is None:
+            schema = schemas[ordered] = marshal.compile(self.nested, ordered=ordered)
+        return schema
+
+    def output(self, key, obj, ordered=None):
+        value = self._lookup(key, obj)
         if value is None:
             if self.allow_null:
                 return None
             elif self.default is not None:
                 return self.default
 
-        return marshal(value, self.nested)
+        return self.schema_for(ordered)(value)
 
 
 class List(Raw):
@@ -161,6 +284,8 @@ class List(Raw):
     :param cls_or_instance: The field type the list will contain.
     """
 
+    __slots__ = ('container',)
+
     def __init__(self, cls_or_instance, **kwargs):
         super(List, self).__init__(**kwargs)
         error_msg = ("The type of the list elements must be a subclass of "
@@ -175,12 +300,16 @@ class List(Raw):
             self.container = cls_or_instance
 
     def format(self, value):
+        return self._format(value, None)
+
+    def _format(self, value, ordered):
         # Convert all instances in typed list to container type
         if isinstance(value, set):
             value = list(value)
 
+        output = bind_ordered(self.container, ordered)
         return [
-            self.container.output(idx,
+            output(idx,
                 val if (isinstance(val, dict)
                         or (self.container.attribute
                             and hasattr(val, self.container.attribute)))
@@ -190,16 +319,18 @@ class List(Raw):
             for idx, val in enumerate(value)
         ]
 
-    def output(self, key, data):
-        value = get_value(key if self.attribute is None else self.attribute, data)
+    def output(self, key, data, ordered=None):
+        value = self._lookup(key, data)
         # we cannot really test for external dict behavior
         if is_indexable_but_not_string(value) and not isinstance(value, dict):
+            if type(self).format is List.format:
+                return self._format(value, ordered)
             return self.format(value)
 
         if value is None:
             return self.default
 
-        return [marshal(value, self.container.nested)]
+        return [self.container.schema_for(ordered)(value)]
 
 
 class String(Raw):
@@ -208,6 +339,9 @@ class String(Raw):
     be converted to :class:`unicode` in python2 and :class:`str` in
     python3.
     """
+
+    __slots__ = ()
+
     def format(self, value):
         try:
             return six.text_type(value)
@@ -221,6 +355,9 @@ class Integer(Raw):
     :param int default: The default value for the field, if no value is
         specified.
     """
+
+    __slots__ = ()
+
     def __init__(self, default=0, **kwargs):
         super(Integer, self).__init__(default=default, **kwargs)
 
@@ -240,6 +377,9 @@ class Boolean(Raw):
     Empty collections such as ``""``, ``{}``, ``[]``, etc. will be converted to
     ``False``.
     """
+
+    __slots__ = ()
+
     def format(self, value):
         return bool(value)
 
@@ -262,6 +402,9 @@ class FormattedString(Raw):
         }
         marshal(data, fields)
     """
+
+    __slots__ = ('src_str',)
+
     def __init__(self, src_str):
         """
         :param string src_str: the string to format with the other
@@ -291,6 +434,9 @@ class Url(Raw):
     :param scheme: URL scheme specifier (e.g. ``http``, ``https``)
     :type scheme: str
     """
+
+    __slots__ = ('endpoint', 'absolute', 'scheme')
+
     def __init__(self, endpoint=None, absolute=False, scheme=None, **kwargs):
         super(Url, self).__init__(**kwargs)
         self.endpoint = endpoint
@@ -317,6 +463,8 @@ class Float(Raw):
     -inf
     """
 
+    __slots__ = ()
+
     def format(self, value):
         try:
             return float(value)
@@ -330,6 +478,8 @@ class Arbitrary(Raw):
           ex: 634271127864378216478362784632784678324.23432
     """
 
+    __slots__ = ()
+
     def format(self, value):
         return six.text_type(MyDecimal(value))
 
@@ -346,21 +496,35 @@ class DateTime(Raw):
 
     :param dt_format: ``'rfc822'`` or ``'iso8601'``
     :type dt_format: str
+    :param int cache_size: If set, up to this many formatted values are
+        remembered, which pays off when the same timestamps are output over
+        and over
     """
-    def __init__(self, dt_format='rfc822', **kwargs):
+
+    __slots__ = ('_dt_format', '_formatter', 'cache_size')
+
+    def __init__(self, dt_format='rfc822', cache_size=0, **kwargs):
         super(DateTime, self).__init__(**kwargs)
+        self.cache_size = cache_size
         self.dt_format = dt_format
 
+    @property
+    def dt_format(self):
+        return self._dt_format
+
+    @dt_format.setter
+    def dt_format(self, dt_format):
+        self._dt_format = dt_format
+        formatter = _datetime_formatters.get(dt_format)
+        if formatter is None:
+            formatter = partial(_unsupported_format, dt_format)
+        elif self.cache_size:
+            formatter = _cached_formatter(formatter, self.cache_size)
+        self._formatter = formatter
+
     def format(self, value):
         try:
-            if self.dt_format == 'rfc822':
-                return _rfc822(value)
-            elif self.dt_format == 'iso8601':
-                return _iso8601(value)
-            else:
-                raise MarshallingException(
-                    'Unsupported date format %s' % self.dt_format
-                )
+            return self._formatter(value)
         except AttributeError as ae:
             raise MarshallingException(ae)
 
@@ -371,6 +535,9 @@ class Fixed(Raw):
     """
     A decimal number with a fixed precision.
     """
+
+    __slots__ = ('precision',)
+
     def __init__(self, decimals=5, **kwargs):
         super(Fixed, self).__init__(**kwargs)
         self.precision = MyDecimal('0.' + '0' * (decimals - 1) + '1')
@@ -386,9 +553,17 @@ class Fixed(Raw):
 Price = Fixed
 
 
+_WEEKDAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+_MONTHS = (None, 'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+           'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+
 def _rfc822(dt):
     """Turn a datetime object into a formatted date.
 
+    Gives the same result as :func:`email.utils.formatdate`, without the
+    round trip through a timestamp.
+
     Example::
 
         fields._rfc822(datetime(2011, 1, 1)) => "Sat, 01 Jan 2011 00:00:00 -0000"
@@ -397,7 +572,10 @@ def _rfc822(dt):
     :type dt: datetime
     :return: A RFC 822 formatted date string
     """
-    return formatdate(timegm(dt.utctimetuple()))
+    tt = dt.utctimetuple()
+    return '%s, %02d %s %04d %02d:%02d:%02d -0000' % (
+        _WEEKDAYS[tt.tm_wday], tt.tm_mday, _MONTHS[tt.tm_mon], tt.tm_year,
+        tt.tm_hour, tt.tm_min, tt.tm_sec)
 
 
 def _iso8601(dt):
@@ -412,3 +590,121 @@ def _iso8601(dt):
     :return: A ISO 8601 formatted date string
     """
     return dt.isoformat()
+
+
+_datetime_formatters = {
+    'rfc822': _rfc822,
+    'iso8601': _iso8601,
+}
+
+
+def _unsupported_format(dt_format, dt):
+    raise MarshallingException('Unsupported date format %s' % dt_format)
+
+
+def _cached_formatter(formatter, size):
+    """Wraps a datetime formatter with a cache of up to ``size`` results.
+
+    The cache is simply emptied when it is full: it is meant for timestamps
+    that repeat in bursts, and looking values up must stay cheaper than
+    formatting them.
+    """
+    cache = {}
+
+    def format(dt):
+        # Equal datetimes can still differ in their time zone and fold, and
+        # so in how they are formatted
+        key = (dt, getattr(dt, 'tzinfo', None), getattr(dt, 'fold', 0))
+        try:
+            return cache[key]
+        except KeyError:
+            pass
+        except TypeError:
+            return formatter(dt)
+        formatted = formatter(dt)
+        if len(cache) >= size:
+            cache.clear()
+        cache[key] = formatted
+        return formatted
+    return format
+
+
+# Column formatting used by batched marshalling, keyed by exact field type:
+# (convert, wrap ValueError in MarshallingException, array kinds whose
+# tolist() output is already correctly typed, array kinds that can be cast
+# in one step, dtype to cast them to). Array kinds are NumPy dtype kinds.
+_column_formats = {
+    Raw: (None, False, (), (), None),
+    String: (six.text_type, True, (), (), None),
+    Integer: (int, True, ('i', 'u'), ('b',), 'int64'),
+    Float: (float, True, ('f',), ('i', 'u', 'b'), 'float64'),
+    Boolean: (bool, False, ('b',), ('i', 'u', 'f'), 'bool'),
+}
+
+
+def _array_kind(column):
+    """Returns the dtype kind of an array-like column (a NumPy array or a
+    pandas Series), or ``None`` for plain sequences."""
+    if not hasattr(column, 'tolist'):
+        return None
+    return getattr(getattr(column, 'dtype', None), 'kind', None)
+
+
+def bind_ordered(field, ordered):
+    """Returns the ``output`` method of ``field``, made to build nested
+    records as :class:`~collections.OrderedDict` or plain dicts as
+    ``ordered`` says if it is a :class:`Nested` or :class:`List` field. Used
+    by :class:`~flask_restful.CompiledSchema` to hand its ``ordered`` setting
+    down to the fields it holds.
+
+    :param field: The field instance
+    :param bool ordered: whether nested records are ordered, or None to
+        follow the ``RESTFUL_MARSHAL_ORDERED`` config setting
+    """
+    if type(field).output in (Nested.output, List.output):
+        return partial(field.output, ordered=ordered)
+    return field.output
+
+
+def _uses_standard_output(field):
+    """Whether ``field`` produces its value by looking up its key (or
+    attribute), returning the default for ``None`` and formatting anything
+    else, as :meth:`Raw.output` does."""
+    return type(field).output is Raw.output
+
+
+def format_column(field, column):
+    """Formats a whole column of values for a field that uses the standard
+    :meth:`Raw.output` behaviour, giving the same results as formatting the
+    values one by one. Built-in scalar fields convert the column in a single
+    pass, and NumPy arrays or pandas Series of a matching dtype are converted
+    without looking at individual values.
+
+    :param field: The field instance to format the values for
+    :param column: A sequence of raw values, or an array-like with ``dtype``
+        and ``tolist``
+    :return: A list of formatted values
+    """
+    spec = _column_formats.get(type(field))
+    kind = _array_kind(column)
+    if spec is not None and kind is not None:
+        if kind in spec[2]:
+            return column.tolist()
+        if kind in spec[3]:
+            return column.astype(spec[4]).tolist()
+
+    values = column.tolist() if kind is not None else column
+    default = field.default
+    if spec is None:
+        convert, wrap_errors = field.format, False
+    else:
+        convert, wrap_errors = spec[:2]
+        if convert is None:
+            return [default if value is None else value for value in values]
+
+    try:
+        return [default if value is None else convert(value) for value in values]
+    except ValueError as error:
+        if not wrap_errors:
+            raise
+        raise MarshallingException(error)
@@ -1,10 +1,15 @@
 from calendar import timegm
-from datetime import datetime, time, timedelta
+from datetime import date as _date, datetime, time, timedelta
 from email.utils import parsedate_tz, mktime_tz
 import re
 
+import sys
+
 import aniso8601
 import pytz
+import six
+
+from flask_restful.utils import LRUCache
 
 # Constants for upgrading date-based intervals to full datetimes.
 START_OF_DAY = time(0, 0, 0, tzinfo=pytz.UTC)
@@ -68,7 +73,12 @@ class regex(object):
         return value
 
     def __deepcopy__(self, memo):
-        return regex(self.pattern)
+        # Compiled patterns are immutable, so the copy can share this one
+        # rather than compile it again
+        regex_copy = self.__class__.__new__(self.__class__)
+        regex_copy.pattern = self.pattern
+        regex_copy.re = self.re
+        return regex_copy
 
 
 def _normalize_interval(start, end, value):
@@ -126,6 +136,126 @@ def _expand_datetime(start, value):
     return end
 
 
+# The common forms of ISO 8601 dates, datetimes and durations, parsed
+# without aniso8601. Anything else, such as basic format, ordinal or week
+# dates, leap seconds or calendar durations, is left to aniso8601.
+_datetime_re = re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})'
+    r'(?:T(\d{2})(?::(\d{2})(?::(\d{2})(?:[.,](\d+))?)?)?'
+    r'(?:(Z)|([+-])(\d{2})(?::?(\d{2}))?)?)?\Z')
+_duration_re = re.compile(
+    r'P(?:(\d+)W|(?:(\d+)D)?(?:T(?=\d)(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?)\Z')
+
+# datetime.fromisoformat only handles most of ISO 8601 from Python 3.11
+_fromisoformat = datetime.fromisoformat if sys.version_info >= (3, 11) else None
+
+#: The number of interval strings whose parsed intervals are remembered
+ISO8601_INTERVAL_CACHE_SIZE = 256
+
+_interval_cache = LRUCache(ISO8601_INTERVAL_CACHE_SIZE)
+
+
+def _parse_datetime_fast(value):
+    """Parses a date or a datetime in the extended ISO 8601 format, as
+    aniso8601 would.
+
+    :return: The date or datetime and the resolution of the input as a
+        timedelta, or ``None`` if the value is not in one of the common forms
+    :raises: ValueError, if the date or time is out of range
+    """
+    match = _datetime_re.match(value)
+    if match is None:
+        return None
+    (year, month, day, hour, minute, second, fraction,
+     utc, sign, offset_hours, offset_minutes) = match.groups()
+
+    if hour is None:
+        return _date(int(year), int(month), int(day)), timedelta(days=1)
+
+    hour, minute, second = int(hour), int(minute or 0), int(second or 0)
+    if hour > 23 or minute > 59 or second > 59:
+        return None
+
+    tzinfo = None
+    if utc:
+        tzinfo = pytz.UTC
+    elif sign:
+        offset_hours, offset_minutes = int(offset_hours), int(offset_minutes or 0)
+        offset = offset_hours * 60 + offset_minutes
+        if offset_hours > 23 or offset_minutes > 59 or (sign == '-' and not offset):
+            return None
+        tzinfo = pytz.FixedOffset(-offset if sign == '-' else offset)
+
+    # Digits past the microseconds are dropped
+    microsecond = int(fraction[:6].ljust(6, '0')) if fraction else 0
+    if match.group(6) is not None:
+        resolution = timedelta(seconds=1)
+    elif match.group(5) is not None:
+        resolution = timedelta(minutes=1)
+    else:
+        resolution = timedelta(hours=1)
+    return datetime(int(year), int(month), int(day), hour, minute, second,
+                    microsecond, tzinfo), resolution
+
+
+def _parse_duration_fast(value):
+    """Parses an ISO 8601 duration made of weeks, days, hours, minutes and
+    seconds in whole numbers.
+
+    :return: The duration as a timedelta and whether it has a time part, or
+        ``None`` if the value is not in one of these forms
+    """
+    match = _duration_re.match(value)
+    if match is None or value == 'P':
+        return None
+    weeks, days, hours, minutes, seconds = (int(group or 0) for group in match.groups())
+    duration = timedelta(weeks=weeks, days=days, hours=hours,
+                         minutes=minutes, seconds=seconds)
+    return duration, 'T' in value
+
+
+def _parse_interval_fast(value):
+    """Parses the common forms of intervals and single dates or datetimes
+    in one pass, without aniso8601.
+
+    :return: The start and end of the interval, or ``None`` if the value is
+        not in one of the common forms
+    """
+    parts = value.split('/')
+    if len(parts) > 2:
+        return None
+
+    try:
+        parsed = _parse_datetime_fast(parts[0])
+        if parsed is None:
+            return None
+        start, resolution = parsed
+        if len(parts) == 1:
+            return start, start + resolution
+
+        parsed = _parse_datetime_fast(parts[1])
+        if parsed is not None:
+            end = parsed[0]
+            # Mixing dates and datetimes, or naive and aware datetimes, is
+            # left for aniso8601 to reject
+            if type(start) is not type(end) or (
+                    isinstance(start, datetime)
+                    and (start.tzinfo is None) != (end.tzinfo is None)):
+                return None
+            return min(start, end), max(start, end)
+
+        parsed = _parse_duration_fast(parts[1])
+        if parsed is None:
+            return None
+        duration, has_time = parsed
+        if has_time and not isinstance(start, datetime):
+            return None
+        return start, start + duration
+    except (ValueError, OverflowError):
+        # Out of range values get aniso8601's handling
+        return None
+
+
 def _parse_interval(value):
     """Do some nasty try/except voodoo to get some sort of datetime
     object(s) out of the string.
@@ -167,11 +297,21 @@ def iso8601interval(value, argument='argument'):
     :raises: ValueError, if the interval is invalid.
     """
 
+    cacheable = isinstance(value, six.string_types)
+    if cacheable:
+        interval = _interval_cache.get(value)
+        if interval is not None:
+            return interval
+
     try:
-        start, end = _parse_interval(value)
+        interval = _parse_interval_fast(value) if cacheable else None
+        if interval is None:
+            start, end = _parse_interval(value)
 
-        if end is None:
-            end = _expand_datetime(start, value)
+            if end is None:
+                end = _expand_datetime(start, value)
+        else:
+            start, end = interval
 
         start, end = _normalize_interval(start, end, value)
 
@@ -181,7 +321,10 @@ def iso8601interval(value, argument='argument'):
             "date/time interval.".format(arg=argument, value=value),
         )
 
-    return start, end
+    interval = start, end
+    if cacheable:
+        _interval_cache.set(value, interval)
+    return interval
 
 
 def date(value):
@@ -279,4 +422,28 @@ def datetime_from_iso8601(datetime_str):
     :type datetime_str: str
     :return: A datetime
     """
+    if _fromisoformat is not None and isinstance(datetime_str, six.string_types):
+        match = _datetime_re.match(datetime_str)
+        if match is not None and _fromisoformat_agrees(match):
+            try:
+                return _fromisoformat(datetime_str)
+            except ValueError:
+                # Out of range values get aniso8601's errors
+                pass
     return aniso8601.parse_datetime(datetime_str)
+
+
+def _fromisoformat_agrees(match):
+    """Whether :meth:`datetime.datetime.fromisoformat` parses a value
+    matched by ``_datetime_re`` as aniso8601 would: it also accepts dates
+    without a time, negative zero offsets and offsets with 60 or more
+    minutes, which aniso8601 rejects.
+    """
+    if match.group(4) is None:
+        return False
+    sign, offset_hours, offset_minutes = match.group(9, 10, 11)
+    if sign is None:
+        return True
+    offset_hours, offset_minutes = int(offset_hours), int(offset_minutes or 0)
+    return (offset_hours <= 23 and offset_minutes <= 59
+            and (sign == '+' or offset_hours + offset_minutes > 0))
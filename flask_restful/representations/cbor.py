@@ -0,0 +1,399 @@
+from __future__ import absolute_import
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+import math
+import struct
+
+from flask import current_app, stream_with_context
+from werkzeug.exceptions import BadRequest
+import pytz
+import six
+
+import flask_restful
+from flask_restful.inputs import datetime_from_iso8601
+from flask_restful.representations.json import STREAM_CHUNK_SIZE
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+#: The mediatypes request bodies are decoded as CBOR for
+CBOR_MEDIATYPES = frozenset(['application/cbor'])
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=pytz.UTC)
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Tags from the IANA CBOR tags registry
+_DATETIME_STRING = 0
+_DATETIME_EPOCH = 1
+_POSITIVE_BIGNUM = 2
+_NEGATIVE_BIGNUM = 3
+_DECIMAL_FRACTION = 4
+_DATE_EPOCH = 100
+_DATE_STRING = 1004
+
+# Major types
+_UNSIGNED, _NEGATIVE, _BYTES, _TEXT, _ARRAY, _MAP, _TAG, _SIMPLE = range(8)
+
+# The "break" stop code ending indefinite length items
+_BREAK = object()
+
+_uint8, _uint16, _uint32, _uint64 = (struct.Struct(f) for f in ('>B', '>H', '>I', '>Q'))
+_float32, _float64 = struct.Struct('>f'), struct.Struct('>d')
+
+
+def _header(major, value):
+    major <<= 5
+    if value < 24:
+        return _uint8.pack(major | value)
+    if value < 0x100:
+        return _uint8.pack(major | 24) + _uint8.pack(value)
+    if value < 0x10000:
+        return _uint8.pack(major | 25) + _uint16.pack(value)
+    if value < 0x100000000:
+        return _uint8.pack(major | 26) + _uint32.pack(value)
+    return _uint8.pack(major | 27) + _uint64.pack(value)
+
+
+def _int_to_bytes(value):
+    data = bytearray()
+    while value:
+        data.append(value & 0xff)
+        value >>= 8
+    data.reverse()
+    return bytes(data)
+
+
+def _encode_int(value, append):
+    major = _UNSIGNED
+    if value < 0:
+        major, value = _NEGATIVE, -1 - value
+    if value < 0x10000000000000000:
+        append(_header(major, value))
+    else:
+        data = _int_to_bytes(value)
+        append(_header(_TAG, _POSITIVE_BIGNUM + major) + _header(_BYTES, len(data)) + data)
+
+
+def _encode_datetime(value, append):
+    if value.tzinfo is None:
+        value = pytz.UTC.localize(value)
+    else:
+        value = value.astimezone(pytz.UTC)
+    text = value.replace(tzinfo=None).isoformat() + 'Z'
+    _encode(_Tagged(_DATETIME_STRING, six.text_type(text)), append)
+
+
+def _encode_decimal(value, append):
+    if not value.is_finite():
+        append(b'\xfb' + _float64.pack(float(value)))
+        return
+    sign, digits, exponent = value.as_tuple()
+    mantissa = 0
+    for digit in digits:
+        mantissa = mantissa * 10 + digit
+    if sign:
+        mantissa = -mantissa
+    _encode(_Tagged(_DECIMAL_FRACTION, [exponent, mantissa]), append)
+
+
+class _Tagged(object):
+    __slots__ = ('tag', 'value')
+
+    def __init__(self, tag, value):
+        self.tag = tag
+        self.value = value
+
+
+def _encode(value, append):
+    if value is None:
+        append(b'\xf6')
+    elif value is True:
+        append(b'\xf5')
+    elif value is False:
+        append(b'\xf4')
+    elif isinstance(value, six.integer_types):
+        _encode_int(value, append)
+    elif isinstance(value, float):
+        append(b'\xfb' + _float64.pack(value))
+    elif isinstance(value, six.text_type):
+        value = value.encode('utf-8')
+        append(_header(_TEXT, len(value)))
+        append(value)
+    elif isinstance(value, (six.binary_type, bytearray)):
+        append(_header(_BYTES, len(value)))
+        append(bytes(value))
+    elif isinstance(value, Mapping):
+        append(_header(_MAP, len(value)))
+        for key, item in six.iteritems(value):
+            _encode(key, append)
+            _encode(item, append)
+    elif isinstance(value, (list, tuple)):
+        append(_header(_ARRAY, len(value)))
+        for item in value:
+            _encode(item, append)
+    elif isinstance(value, datetime):
+        _encode_datetime(value, append)
+    elif isinstance(value, date):
+        _encode(_Tagged(_DATE_STRING, six.text_type(value.isoformat())), append)
+    elif isinstance(value, Decimal):
+        _encode_decimal(value, append)
+    elif isinstance(value, _Tagged):
+        append(_header(_TAG, value.tag))
+        _encode(value.value, append)
+    else:
+        raise TypeError('%r is not CBOR serializable' % (value,))
+
+
+def encode(value):
+    """Encodes ``value`` to CBOR in pure Python. Decimals are encoded as
+    decimal fractions (tag 4), datetimes as RFC 3339 strings in UTC (tag 0),
+    naive ones being taken as UTC, and dates as ISO 8601 strings (tag 1004).
+
+    :rtype: bytes
+    """
+    chunks = []
+    _encode(value, chunks.append)
+    return b''.join(chunks)
+
+
+def _half_float(value):
+    exponent, fraction = (value >> 10) & 0x1f, value & 0x3ff
+    if exponent == 0:
+        decoded = math.ldexp(fraction, -24)
+    elif exponent == 31:
+        decoded = float('nan') if fraction else float('inf')
+    else:
+        decoded = math.ldexp(fraction + 1024, exponent - 25)
+    return -decoded if value & 0x8000 else decoded
+
+
+def _decode_tag(tag, value):
+    """Converts the value of the tags CBOR has standard Python types for.
+    The values of other tags are returned as they are."""
+    if tag == _DATETIME_STRING:
+        return datetime_from_iso8601(value)
+    if tag == _DATETIME_EPOCH:
+        return _EPOCH + timedelta(seconds=value)
+    if tag in (_POSITIVE_BIGNUM, _NEGATIVE_BIGNUM):
+        decoded = 0
+        for byte in bytearray(value):
+            decoded = decoded << 8 | byte
+        return decoded if tag == _POSITIVE_BIGNUM else -1 - decoded
+    if tag == _DECIMAL_FRACTION:
+        exponent, mantissa = value
+        digits = tuple(int(digit) for digit in str(abs(mantissa)))
+        return Decimal((int(mantissa < 0), digits, exponent))
+    if tag == _DATE_STRING:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    if tag == _DATE_EPOCH:
+        return date.fromordinal(_EPOCH_ORDINAL + value)
+    return value
+
+
+class _Decoder(object):
+    """Decodes a CBOR document in pure Python."""
+
+    def __init__(self, data):
+        self.data = bytearray(data)
+        self.pos = 0
+
+    def take(self, size):
+        start, end = self.pos, self.pos + size
+        if end > len(self.data):
+            raise ValueError('Truncated CBOR data')
+        self.pos = end
+        return self.data[start:end]
+
+    def unpack(self, fmt):
+        value, = fmt.unpack_from(self.data, self.pos)
+        self.pos += fmt.size
+        return value
+
+    def argument(self, info):
+        if info < 24:
+            return info
+        if info <= 27:
+            return self.unpack((_uint8, _uint16, _uint32, _uint64)[info - 24])
+        if info == 31:
+            return None
+        raise ValueError('Invalid CBOR additional information %d' % info)
+
+    def decode(self):
+        value = self.read()
+        if value is _BREAK:
+            raise ValueError('Unexpected "break" in CBOR data')
+        return value
+
+    def read(self):
+        initial = self.unpack(_uint8)
+        major, info = initial >> 5, initial & 0x1f
+        if major == _SIMPLE:
+            return self.simple(info)
+        size = self.argument(info)
+        if major == _UNSIGNED:
+            return self.defined(size)
+        if major == _NEGATIVE:
+            return -1 - self.defined(size)
+        if major == _BYTES or major == _TEXT:
+            if size is None:
+                data = b''.join(self.chunks(major))
+            else:
+                data = bytes(self.take(size))
+            return data if major == _BYTES else data.decode('utf-8')
+        if major == _ARRAY:
+            if size is None:
+                return list(self.items())
+            return [self.decode() for _ in range(size)]
+        if major == _MAP:
+            decoded = {}
+            if size is None:
+                items = self.items()
+                for key in items:
+                    decoded[key] = next(items)
+            else:
+                for _ in range(size):
+                    key = self.decode()
+                    decoded[key] = self.decode()
+            return decoded
+        return _decode_tag(self.defined(size), self.decode())
+
+    def defined(self, size):
+        if size is None:
+            raise ValueError('Invalid indefinite length CBOR item')
+        return size
+
+    def items(self):
+        """Yields the items of an indefinite length array or map."""
+        while True:
+            item = self.read()
+            if item is _BREAK:
+                return
+            yield item
+
+    def chunks(self, major):
+        """Yields the chunks of an indefinite length string, which must be
+        definite length strings of the same type."""
+        while True:
+            initial = self.unpack(_uint8)
+            if initial == 0xff:
+                return
+            if initial >> 5 != major or initial & 0x1f == 31:
+                raise ValueError('Invalid chunk in an indefinite length CBOR string')
+            yield bytes(self.take(self.argument(initial & 0x1f)))
+
+    def simple(self, info):
+        if info == 20:
+            return False
+        if info == 21:
+            return True
+        if info == 22 or info == 23:
+            return None
+        if info == 25:
+            return _half_float(self.unpack(_uint16))
+        if info == 26:
+            return self.unpack(_float32)
+        if info == 27:
+            return self.unpack(_float64)
+        if info == 31:
+            return _BREAK
+        raise ValueError('Unsupported CBOR simple value %d' % info)
+
+
+def decode(data):
+    """Decodes a CBOR document in pure Python, converting the values of the
+    tags :func:`encode` writes back.
+
+    :raises ValueError: if ``data`` is not a single valid document
+    """
+    decoder = _Decoder(data)
+    try:
+        value = decoder.decode()
+    except (struct.error, TypeError, UnicodeDecodeError, StopIteration, RuntimeError,
+            OverflowError) as e:
+        # RuntimeError is raised for documents nested too deeply, OverflowError
+        # for tagged dates and datetimes out of range
+        raise ValueError('Invalid CBOR data: %s' % e)
+    if decoder.pos != len(decoder.data):
+        raise ValueError('Extra data after the CBOR document')
+    return value
+
+
+def dumps(value):
+    """Encodes ``value`` to CBOR, with the :mod:`cbor2` package if it is
+    installed and in pure Python otherwise.
+
+    :rtype: bytes
+    """
+    if cbor2 is None:
+        return encode(value)
+    return cbor2.dumps(value, timezone=pytz.UTC)
+
+
+def loads(data):
+    """Decodes a CBOR document, with the :mod:`cbor2` package if it is
+    installed and in pure Python otherwise.
+
+    :raises ValueError: if ``data`` is not a single valid document
+    """
+    if cbor2 is None:
+        return decode(data)
+    try:
+        return cbor2.loads(data)
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError('Invalid CBOR data: %s' % e)
+
+
+def output_cbor(data, code, headers=None):
+    """Makes a Flask response with a CBOR encoded body"""
+    if isinstance(data, flask_restful.MarshalledStream):
+        resp = current_app.response_class(
+            stream_with_context(_stream_cbor(data, dumps)),
+            status=code, mimetype='application/cbor')
+    else:
+        resp = current_app.response_class(dumps(data), status=code,
+                                          mimetype='application/cbor')
+    resp.headers.extend(headers or {})
+    return resp
+
+
+def _stream_cbor(stream, encode):
+    """Yields an indefinite length CBOR array of the records in ``stream``,
+    enveloped in a map if the stream has an envelope, a chunk at a time."""
+    opening = b'\x9f'
+    if stream.envelope:
+        opening = b'\xa1' + encode(stream.envelope) + opening
+
+    chunk, size = [opening], len(opening)
+    for record in stream:
+        encoded = encode(record)
+        chunk.append(encoded)
+        size += len(encoded)
+        if size >= STREAM_CHUNK_SIZE:
+            yield b''.join(chunk)
+            chunk, size = [], 0
+    chunk.append(b'\xff')
+    yield b''.join(chunk)
+
+
+def request_cbor(request):
+    """Returns the decoded CBOR body of ``request``, or ``None`` if it is not
+    CBOR. Used for the ``'cbor'`` location of
+    :class:`~flask_restful.reqparse.Argument`.
+
+    :raises werkzeug.exceptions.BadRequest: if the body can't be decoded
+    """
+    if request.mimetype not in CBOR_MEDIATYPES:
+        return None
+    try:
+        return loads(request.get_data(cache=True))
+    except ValueError:
+        raise BadRequest('Failed to decode the CBOR body')
@@ -1,25 +1,327 @@
 from __future__ import absolute_import
-from flask import make_response, current_app
+from collections import OrderedDict
+from flask import make_response, current_app, stream_with_context
 from flask_restful.utils import PY3
-from json import dumps
+from json import dumps, JSONEncoder
+import warnings
+import six
+import flask_restful
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+# Streamed JSON is sent in chunks of roughly this many characters
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Key under which the resolved JSON encoders are kept in ``app.extensions``
+_EXTENSION_KEY = 'flask_restful.json'
+
+# The separators written by backends that do not take a ``separators``
+# setting, depending on whether the output is indented or not
+_COMPACT_SEPARATORS = (',', ':')
+_INDENT_SEPARATORS = (',', ': ')
+
+
+def _to_bytes(dumped):
+    if isinstance(dumped, six.text_type):
+        return dumped.encode('utf-8')
+    return dumped
+
+
+def _check_settings(name, settings, supported):
+    unsupported = sorted(set(settings) - set(supported))
+    if unsupported:
+        raise ValueError('The %s JSON backend does not support %s'
+                         % (name, ', '.join(unsupported)))
+
+
+def _check_separators(name, settings):
+    separators = settings.get('separators')
+    if separators is None:
+        return
+    expected = _INDENT_SEPARATORS if settings.get('indent') else _COMPACT_SEPARATORS
+    if tuple(separators) != expected:
+        raise ValueError('The %s JSON backend only supports %r separators'
+                         % (name, expected))
+
+
+def json_encoder(settings, newline):
+    """Builds an encoder using the :mod:`json` module of the standard
+    library.  Every setting is passed on to the encoder class, which is
+    ``settings['cls']`` if given, as with :py:func:`json.dumps`."""
+    settings = dict(settings)
+    cls = settings.pop('cls', None) or JSONEncoder
+    encode = cls(**settings).encode
+
+    if newline:
+        def encoder(data):
+            return _to_bytes(encode(data) + "\n")
+    else:
+        def encoder(data):
+            return _to_bytes(encode(data))
+    return encoder
+
+
+def orjson_encoder(settings, newline):
+    """Builds an encoder using :mod:`orjson`.  Only the ``sort_keys``,
+    ``default``, ``separators`` and ``indent`` (of 2) settings can be
+    honoured."""
+    import orjson
+
+    _check_settings('orjson', settings,
+                    ('sort_keys', 'default', 'indent', 'separators'))
+    _check_separators('orjson', settings)
+    option = orjson.OPT_NON_STR_KEYS
+    if settings.get('sort_keys'):
+        option |= orjson.OPT_SORT_KEYS
+    if settings.get('indent'):
+        if settings['indent'] != 2:
+            raise ValueError('The orjson JSON backend only supports an indent of 2')
+        option |= orjson.OPT_INDENT_2
+    if newline:
+        option |= orjson.OPT_APPEND_NEWLINE
+    default, encode = settings.get('default'), orjson.dumps
+
+    def encoder(data):
+        return encode(data, default=default, option=option)
+    return encoder
+
+
+def ujson_encoder(settings, newline):
+    """Builds an encoder using :mod:`ujson`.  Only the ``ensure_ascii``,
+    ``sort_keys``, ``default``, ``separators`` and ``indent`` settings can be
+    honoured."""
+    import ujson
+
+    _check_settings('ujson', settings,
+                    ('ensure_ascii', 'sort_keys', 'default', 'indent', 'separators'))
+    kwargs = dict(settings, escape_forward_slashes=False)
+    kwargs['indent'] = kwargs.get('indent') or 0
+    kwargs.setdefault('separators', _INDENT_SEPARATORS if kwargs['indent'] else (', ', ': '))
+    encode = ujson.dumps
+
+    if newline:
+        def encoder(data):
+            return _to_bytes(encode(data, **kwargs) + "\n")
+    else:
+        def encoder(data):
+            return _to_bytes(encode(data, **kwargs))
+    return encoder
+
+
+def rapidjson_encoder(settings, newline):
+    """Builds an encoder using :mod:`rapidjson`.  Only the ``ensure_ascii``,
+    ``sort_keys``, ``default``, ``skipkeys``, ``allow_nan``, ``separators``
+    and ``indent`` settings can be honoured."""
+    import rapidjson
+
+    _check_settings('rapidjson', settings,
+                    ('ensure_ascii', 'sort_keys', 'default', 'skipkeys',
+                     'allow_nan', 'indent', 'separators'))
+    _check_separators('rapidjson', settings)
+    kwargs = dict(settings, mapping_mode=rapidjson.MM_COERCE_KEYS_TO_STRINGS)
+    kwargs.pop('separators', None)
+    if not kwargs.get('indent'):
+        kwargs.pop('indent', None)
+    encode = rapidjson.dumps
+
+    if newline:
+        def encoder(data):
+            return _to_bytes(encode(data, **kwargs) + "\n")
+    else:
+        def encoder(data):
+            return _to_bytes(encode(data, **kwargs))
+    return encoder
+
+
+#: The JSON backends that can be selected with the ``RESTFUL_JSON_BACKEND``
+#: config setting, mapped to a factory taking the ``RESTFUL_JSON`` settings
+#: and whether a trailing newline should be written.  Factories return a
+#: function encoding data to bytes; they raise :exc:`ImportError` if the
+#: backend is not installed and :exc:`ValueError` if it cannot honour the
+#: settings.  ``'auto'`` picks the first usable backend in this order.
+BACKENDS = OrderedDict([
+    ('orjson', orjson_encoder),
+    ('rapidjson', rapidjson_encoder),
+    ('ujson', ujson_encoder),
+    ('json', json_encoder),
+])
+
+
+def _fallback(encoder, fallback):
+    """Retries data the backend cannot encode, such as integers too large
+    for it, with the standard library so results do not depend on it."""
+    def encode(data):
+        try:
+            return encoder(data)
+        except (TypeError, OverflowError):
+            return fallback(data)
+    return encode
+
+
+def _resolve_encoder(backend, settings, newline):
+    fallback = json_encoder(settings, newline)
+    if backend == 'json':
+        return fallback
+
+    if backend == 'auto':
+        candidates = [name for name in BACKENDS if name != 'json']
+    elif backend in BACKENDS:
+        candidates = [backend]
+    else:
+        raise ValueError('Unknown RESTFUL_JSON_BACKEND %r' % (backend,))
+
+    for name in candidates:
+        try:
+            encoder = BACKENDS[name](settings, newline)
+        except ImportError:
+            if backend != 'auto':
+                warnings.warn('The %s JSON backend is not installed, falling '
+                              'back to the json module' % name)
+        except ValueError as e:
+            if backend != 'auto':
+                warnings.warn('%s, falling back to the json module' % e)
+        else:
+            return _fallback(encoder, fallback)
+    return fallback
+
+
+class JSONEncoders(object):
+    """The JSON encoders of an application, resolved from its
+    ``RESTFUL_JSON_BACKEND`` and ``RESTFUL_JSON`` config settings.
+
+    :param app: the Flask application
+    """
+    def __init__(self, app):
+        self.config = app.config.get('RESTFUL_JSON')
+        self.backend = app.config.get('RESTFUL_JSON_BACKEND', 'json')
+        self.debug = app.debug
+
+        settings = dict(self.config or {})
+        # If we're in debug mode, and the indent is not set, we set it to a
+        # reasonable value here.  Note that this won't override any existing
+        # value that was set.  We also set the "sort_keys" value.
+        if self.debug:
+            settings.setdefault('indent', 4)
+            settings.setdefault('sort_keys', not PY3)
+        self.settings = settings
+
+        #: Encodes a complete response body, ending with a newline
+        self.body = _resolve_encoder(self.backend, settings, True)
+        #: Encodes a value on its own, without a trailing newline
+        self.value = _resolve_encoder(self.backend, settings, False)
+        self._line = None
+
+    @property
+    def line(self):
+        """Encodes a value on a single line, ending with a newline, as in
+        NDJSON.  Resolved when first used, without the ``indent`` setting."""
+        if self._line is None:
+            settings = dict(self.settings)
+            settings.pop('indent', None)
+            self._line = _resolve_encoder(self.backend, settings, True)
+        return self._line
+
+    def matches(self, app):
+        """Whether the encoders are still valid for the config of ``app``."""
+        return (app.config.get('RESTFUL_JSON') is self.config
+                and app.config.get('RESTFUL_JSON_BACKEND', 'json') == self.backend
+                and app.debug == self.debug)
+
+
+def init_app(app):
+    """Resolves the JSON encoders of ``app`` ahead of its first response.
+
+    :param app: the Flask application
+    :rtype: JSONEncoders
+    """
+    encoders = JSONEncoders(app)
+    app.extensions[_EXTENSION_KEY] = encoders
+    return encoders
+
+
+def get_encoders(app):
+    """Returns the JSON encoders of ``app``, resolving them again if the
+    relevant config settings were replaced since they were last resolved.
+
+    :param app: the Flask application
+    :rtype: JSONEncoders
+    """
+    encoders = app.extensions.get(_EXTENSION_KEY)
+    if encoders is None or not encoders.matches(app):
+        encoders = init_app(app)
+    return encoders
 
 
 def output_json(data, code, headers=None):
     """Makes a Flask response with a JSON encoded body"""
 
-    settings = current_app.config.get('RESTFUL_JSON', {})
+    encoders = get_encoders(current_app)
 
-    # If we're in debug mode, and the indent is not set, we set it to a
-    # reasonable value here.  Note that this won't override any existing value
-    # that was set.  We also set the "sort_keys" value.
-    if current_app.debug:
-        settings.setdefault('indent', 4)
-        settings.setdefault('sort_keys', not PY3)
+    if isinstance(data, flask_restful.MarshalledStream):
+        resp = current_app.response_class(
+            stream_with_context(_stream_json(data, encoders.value)),
+            status=code, mimetype='application/json')
+        resp.headers.extend(headers or {})
+        return resp
 
     # always end the json dumps with a new line
     # see https://github.com/mitsuhiko/flask/pull/1262
-    dumped = dumps(data, **settings) + "\n"
+    resp = make_response(encoders.body(data), code)
+    resp.headers.extend(headers or {})
+    return resp
+
 
-    resp = make_response(dumped, code)
+def _stream_json(stream, encode):
+    """Yields a JSON list of the records in ``stream``, enveloped if the
+    stream has an envelope, a chunk at a time."""
+    if stream.envelope:
+        opening, closing = _to_bytes('{%s: [' % dumps(stream.envelope)), b']}\n'
+    else:
+        opening, closing = b'[', b']\n'
+
+    chunk, size, separator = [opening], len(opening), b''
+    for record in stream:
+        dumped = separator + encode(record)
+        chunk.append(dumped)
+        size += len(dumped)
+        separator = b', '
+        if size >= STREAM_CHUNK_SIZE:
+            yield b''.join(chunk)
+            chunk, size = [], 0
+    chunk.append(closing)
+    yield b''.join(chunk)
+
+
+def output_ndjson(data, code, headers=None):
+    """Makes a Flask response with an NDJSON (newline delimited JSON) body,
+    one JSON value per line.  Iterables of records, such as generators and
+    :class:`~flask_restful.MarshalledStream`, are sent as a chunked response
+    as they are consumed; the envelope of a stream is left out.  Other
+    values, such as a dict, are sent as a single line."""
+
+    encoders = get_encoders(current_app)
+
+    if isinstance(data, (Mapping, six.string_types)) or not hasattr(data, '__iter__'):
+        body = encoders.line(data)
+    else:
+        body = stream_with_context(_stream_ndjson(data, encoders.line))
+    resp = current_app.response_class(body, status=code, mimetype='application/x-ndjson')
     resp.headers.extend(headers or {})
     return resp
+
+
+def _stream_ndjson(records, encode):
+    """Yields the lines of the records in ``records``, a chunk at a time."""
+    chunk, size = [], 0
+    for record in records:
+        line = encode(record)
+        chunk.append(line)
+        size += len(line)
+        if size >= STREAM_CHUNK_SIZE:
+            yield b''.join(chunk)
+            chunk, size = [], 0
+    if chunk:
+        yield b''.join(chunk)
@@ -0,0 +1,318 @@
+from __future__ import absolute_import
+from calendar import timegm
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+import struct
+
+from flask import current_app
+from werkzeug.exceptions import BadRequest
+import pytz
+import six
+
+import flask_restful
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+#: The mediatypes request bodies are decoded as MessagePack for
+MSGPACK_MEDIATYPES = frozenset([
+    'application/msgpack',
+    'application/x-msgpack',
+    'application/vnd.msgpack',
+])
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=pytz.UTC)
+
+# The extension type of MessagePack timestamps
+_TIMESTAMP = -1
+
+_uint8, _uint16, _uint32, _uint64 = (struct.Struct(f) for f in ('>B', '>H', '>I', '>Q'))
+_int8, _int16, _int32, _int64 = (struct.Struct(f) for f in ('>b', '>h', '>i', '>q'))
+_float32, _float64 = struct.Struct('>f'), struct.Struct('>d')
+
+
+def _timestamp(value):
+    """Returns the seconds and nanoseconds since the epoch of a datetime,
+    naive ones being taken as UTC."""
+    seconds = timegm(value.utctimetuple())
+    return seconds, value.microsecond * 1000
+
+
+def _pack_int(value, append):
+    if 0 <= value < 0x80:
+        append(_uint8.pack(value))
+    elif -0x20 <= value < 0:
+        append(_int8.pack(value))
+    elif value > 0:
+        if value < 0x100:
+            append(b'\xcc' + _uint8.pack(value))
+        elif value < 0x10000:
+            append(b'\xcd' + _uint16.pack(value))
+        elif value < 0x100000000:
+            append(b'\xce' + _uint32.pack(value))
+        elif value < 0x10000000000000000:
+            append(b'\xcf' + _uint64.pack(value))
+        else:
+            raise OverflowError('Integer too large for MessagePack: %d' % value)
+    elif value >= -0x80:
+        append(b'\xd0' + _int8.pack(value))
+    elif value >= -0x8000:
+        append(b'\xd1' + _int16.pack(value))
+    elif value >= -0x80000000:
+        append(b'\xd2' + _int32.pack(value))
+    elif value >= -0x8000000000000000:
+        append(b'\xd3' + _int64.pack(value))
+    else:
+        raise OverflowError('Integer too large for MessagePack: %d' % value)
+
+
+def _pack_header(size, fix, fix_limit, codes, append):
+    if size < fix_limit:
+        append(_uint8.pack(fix | size))
+    elif codes[0] is not None and size < 0x100:
+        append(codes[0] + _uint8.pack(size))
+    elif size < 0x10000:
+        append(codes[1] + _uint16.pack(size))
+    else:
+        append(codes[2] + _uint32.pack(size))
+
+
+def _pack_timestamp(value, append):
+    seconds, nanoseconds = _timestamp(value)
+    if seconds >> 34 == 0:
+        data = nanoseconds << 34 | seconds
+        if data >> 32 == 0:
+            append(b'\xd6\xff' + _uint32.pack(data))
+        else:
+            append(b'\xd7\xff' + _uint64.pack(data))
+    else:
+        append(b'\xc7\x0c\xff' + _uint32.pack(nanoseconds) + _int64.pack(seconds))
+
+
+def _pack(value, append):
+    if value is None:
+        append(b'\xc0')
+    elif value is True:
+        append(b'\xc3')
+    elif value is False:
+        append(b'\xc2')
+    elif isinstance(value, six.integer_types):
+        _pack_int(value, append)
+    elif isinstance(value, float):
+        append(b'\xcb' + _float64.pack(value))
+    elif isinstance(value, six.text_type):
+        value = value.encode('utf-8')
+        _pack_header(len(value), 0xa0, 32, (b'\xd9', b'\xda', b'\xdb'), append)
+        append(value)
+    elif isinstance(value, (six.binary_type, bytearray)):
+        _pack_header(len(value), 0, 0, (b'\xc4', b'\xc5', b'\xc6'), append)
+        append(bytes(value))
+    elif isinstance(value, Mapping):
+        _pack_header(len(value), 0x80, 16, (None, b'\xde', b'\xdf'), append)
+        for key, item in six.iteritems(value):
+            _pack(key, append)
+            _pack(item, append)
+    elif isinstance(value, (list, tuple)):
+        _pack_header(len(value), 0x90, 16, (None, b'\xdc', b'\xdd'), append)
+        for item in value:
+            _pack(item, append)
+    elif isinstance(value, datetime):
+        _pack_timestamp(value, append)
+    else:
+        _pack(_default(value), append)
+
+
+def _default(value):
+    """Converts the values MessagePack has no type for. Decimals become
+    strings, so that no precision is lost, and dates ISO 8601 strings."""
+    if isinstance(value, Decimal):
+        return six.text_type(value)
+    if isinstance(value, date):
+        return six.text_type(value.isoformat())
+    raise TypeError('%r is not MessagePack serializable' % (value,))
+
+
+def pack(value):
+    """Encodes ``value`` to MessagePack in pure Python. Datetimes are
+    encoded as timestamps, naive ones being taken as UTC.
+
+    :rtype: bytes
+    """
+    chunks = []
+    _pack(value, chunks.append)
+    return b''.join(chunks)
+
+
+class _Unpacker(object):
+    """Decodes a MessagePack document in pure Python."""
+
+    def __init__(self, data):
+        self.data = bytearray(data)
+        self.pos = 0
+
+    def take(self, size):
+        start, end = self.pos, self.pos + size
+        if end > len(self.data):
+            raise ValueError('Truncated MessagePack data')
+        self.pos = end
+        return self.data[start:end]
+
+    def unpack(self, fmt):
+        value, = fmt.unpack_from(self.data, self.pos)
+        self.pos += fmt.size
+        return value
+
+    def decode(self):
+        code = self.unpack(_uint8)
+        if code < 0x80:
+            return code
+        if code >= 0xe0:
+            return code - 0x100
+        if code < 0x90:
+            return self.map(code & 0x0f)
+        if code < 0xa0:
+            return self.array(code & 0x0f)
+        if code < 0xc0:
+            return self.str(code & 0x1f)
+        if code == 0xc0:
+            return None
+        if code == 0xc2:
+            return False
+        if code == 0xc3:
+            return True
+        if 0xc4 <= code <= 0xc6:
+            return bytes(self.take(self.unpack((_uint8, _uint16, _uint32)[code - 0xc4])))
+        if 0xc7 <= code <= 0xc9:
+            size = self.unpack((_uint8, _uint16, _uint32)[code - 0xc7])
+            return self.ext(size)
+        if code == 0xca:
+            return self.unpack(_float32)
+        if code == 0xcb:
+            return self.unpack(_float64)
+        if 0xcc <= code <= 0xd3:
+            return self.unpack((_uint8, _uint16, _uint32, _uint64,
+                                _int8, _int16, _int32, _int64)[code - 0xcc])
+        if 0xd4 <= code <= 0xd8:
+            return self.ext(1 << (code - 0xd4))
+        if 0xd9 <= code <= 0xdb:
+            return self.str(self.unpack((_uint8, _uint16, _uint32)[code - 0xd9]))
+        if code == 0xdc or code == 0xdd:
+            return self.array(self.unpack(_uint16 if code == 0xdc else _uint32))
+        if code == 0xde or code == 0xdf:
+            return self.map(self.unpack(_uint16 if code == 0xde else _uint32))
+        raise ValueError('Invalid MessagePack type 0x%02x' % code)
+
+    def str(self, size):
+        return self.take(size).decode('utf-8')
+
+    def array(self, size):
+        return [self.decode() for _ in range(size)]
+
+    def map(self, size):
+        decoded = {}
+        for _ in range(size):
+            key = self.decode()
+            decoded[key] = self.decode()
+        return decoded
+
+    def ext(self, size):
+        ext_type = self.unpack(_int8)
+        data = self.take(size)
+        if ext_type != _TIMESTAMP or size not in (4, 8, 12):
+            raise ValueError('Unsupported MessagePack extension type %d' % ext_type)
+        if size == 4:
+            seconds, nanoseconds = _uint32.unpack(bytes(data))[0], 0
+        elif size == 8:
+            packed = _uint64.unpack(bytes(data))[0]
+            seconds, nanoseconds = packed & 0x3ffffffff, packed >> 34
+        else:
+            nanoseconds = _uint32.unpack(bytes(data[:4]))[0]
+            seconds = _int64.unpack(bytes(data[4:]))[0]
+        return _EPOCH + timedelta(seconds=seconds, microseconds=nanoseconds // 1000)
+
+
+def unpack(data):
+    """Decodes a MessagePack document in pure Python. Timestamps are decoded
+    to UTC datetimes.
+
+    :raises ValueError: if ``data`` is not a single valid document
+    """
+    unpacker = _Unpacker(data)
+    try:
+        value = unpacker.decode()
+    except (struct.error, TypeError, UnicodeDecodeError, RuntimeError) as e:
+        # RuntimeError is raised for documents nested too deeply
+        raise ValueError('Invalid MessagePack data: %s' % e)
+    if unpacker.pos != len(unpacker.data):
+        raise ValueError('Extra data after the MessagePack document')
+    return value
+
+
+def _msgpack_default(value):
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = pytz.UTC.localize(value)
+        return msgpack.Timestamp.from_datetime(value)
+    return _default(value)
+
+
+def dumps(value):
+    """Encodes ``value`` to MessagePack, with the :mod:`msgpack` package if
+    it is installed and in pure Python otherwise.
+
+    :rtype: bytes
+    """
+    if msgpack is None:
+        return pack(value)
+    return msgpack.packb(value, use_bin_type=True, default=_msgpack_default)
+
+
+def loads(data):
+    """Decodes a MessagePack document, with the :mod:`msgpack` package if it
+    is installed and in pure Python otherwise.
+
+    :raises ValueError: if ``data`` is not a single valid document
+    """
+    if msgpack is None:
+        return unpack(data)
+    try:
+        return msgpack.unpackb(data, raw=False, timestamp=3, strict_map_key=False)
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError('Invalid MessagePack data: %s' % e)
+
+
+def output_msgpack(data, code, headers=None):
+    """Makes a Flask response with a MessagePack encoded body. MessagePack
+    arrays are prefixed with their length, so a :class:`MarshalledStream` is
+    consumed before the response is made."""
+    if isinstance(data, flask_restful.MarshalledStream):
+        records = list(data)
+        data = {data.envelope: records} if data.envelope else records
+    resp = current_app.response_class(dumps(data), status=code,
+                                      mimetype='application/msgpack')
+    resp.headers.extend(headers or {})
+    return resp
+
+
+def request_msgpack(request):
+    """Returns the decoded MessagePack body of ``request``, or ``None`` if it
+    is not MessagePack. Used for the ``'msgpack'`` location of
+    :class:`~flask_restful.reqparse.Argument`.
+
+    :raises werkzeug.exceptions.BadRequest: if the body can't be decoded
+    """
+    if request.mimetype not in MSGPACK_MEDIATYPES:
+        return None
+    try:
+        return loads(request.get_data(cache=True))
+    except ValueError:
+        raise BadRequest('Failed to decode the MessagePack body')
@@ -1,4 +1,4 @@
-from copy import deepcopy
+from copy import copy
 
 try:
     from collections.abc import MutableSequence
@@ -6,13 +6,21 @@ except ImportError:
     from collections import MutableSequence
 from flask import current_app, request
 from werkzeug.datastructures import MultiDict, FileStorage
+from werkzeug.local import LocalProxy
 from werkzeug import exceptions
+from flask_restful import inputs
+from flask_restful.representations.cbor import request_cbor
+from flask_restful.representations.msgpack import request_msgpack
 import flask_restful
 import decimal
+import inspect
 import six
 
 
 class Namespace(dict):
+    # Values are stored as items, so instances need no ``__dict__``
+    __slots__ = ()
+
     def __getattr__(self, name):
         try:
             return self[name]
@@ -31,10 +39,96 @@ _friendly_location = {
     u'headers': u'the HTTP headers',
     u'cookies': u'the request\'s cookies',
     u'files': u'an uploaded file',
+    u'msgpack': u'the MessagePack body',
+    u'cbor': u'the CBOR body',
+}
+
+# Locations whose values are decoded from the request body, rather than read
+# off an attribute of the request
+_body_locations = {
+    u'msgpack': request_msgpack,
+    u'cbor': request_cbor,
 }
 
 text_type = lambda x: six.text_type(x)
 
+# Number of positional arguments (value, name, operator) taken by common
+# converters, including builtins whose signature can't be inspected
+_converter_arities = {
+    int: 1, float: 1, bool: 1, complex: 1, six.text_type: 1, six.binary_type: 1,
+    list: 1, tuple: 1, dict: 1, set: 1, frozenset: 1, decimal.Decimal: 1,
+    text_type: 1, FileStorage: 1,
+    inputs.url: 1, inputs.date: 1, inputs.boolean: 1,
+    inputs.datetime_from_rfc822: 1, inputs.datetime_from_iso8601: 1,
+    inputs.natural: 2, inputs.positive: 2, inputs.iso8601interval: 2,
+}
+
+
+def _converter_arity(converter):
+    """Returns how many of the value, argument name and operator should be
+    passed to ``converter``: as many as its signature accepts, up to 3. None
+    if that can't be told, in which case it has to be found by trial.
+
+    Only the signatures of plain functions and methods are trusted: classes
+    such as enums accept extra positional arguments meaning something else.
+    """
+    try:
+        arity = _converter_arities.get(converter)
+    except TypeError:  # unhashable
+        arity = None
+    if arity is not None:
+        return arity
+
+    if not (inspect.isfunction(converter) or inspect.ismethod(converter)):
+        return None
+    try:
+        signature = inspect.signature(converter)
+    except (AttributeError, TypeError, ValueError):
+        return None
+    for arity in (3, 2, 1):
+        try:
+            signature.bind(*range(arity))
+        except TypeError:
+            continue
+        return arity
+    return None
+
+
+def _location_key(location):
+    """Returns a hashable key for an argument's ``location``, which may be a
+    string or any iterable of strings."""
+    if isinstance(location, six.string_types):
+        return location
+    return tuple(location)
+
+
+def _location_values(request, location, default):
+    """Returns the values of ``request`` in ``location``, or ``default`` if
+    the request has no such attribute."""
+    decode = _body_locations.get(location)
+    if decode is not None:
+        return decode(request)
+    value = getattr(request, location, default)
+    if callable(value):
+        value = value()
+    return value
+
+
+def _request_sources(req):
+    """Returns the values pulled off ``req`` so far, by location key. They
+    are kept on the request object itself, so that every parser used while
+    handling a request shares them."""
+    if isinstance(req, LocalProxy):
+        req = req._get_current_object()
+    try:
+        attributes = req.__dict__
+    except AttributeError:
+        return {}
+    sources = attributes.get('_flask_restful_sources')
+    if sources is None:
+        sources = attributes['_flask_restful_sources'] = {}
+    return sources
+
 
 class Argument(object):
 
@@ -58,6 +152,8 @@ class Argument(object):
     :param location: The attributes of the :class:`flask.Request` object
         to source the arguments from (ex: headers, args, etc.), can be an
         iterator. The last item listed takes precedence in the result set.
+        ``'msgpack'`` and ``'cbor'`` source them from a MessagePack or CBOR
+        request body.
     :param choices: A container of the allowable values for the argument.
     :param help: A brief description of the argument, returned in the
         response when the argument is invalid. May optionally contain
@@ -71,6 +167,11 @@ class Argument(object):
     :param bool nullable: If enabled, allows null value in argument.
     """
 
+    __slots__ = ('name', 'default', 'dest', 'required', 'ignore', 'location',
+                 'type', 'choices', 'action', 'help', 'case_sensitive',
+                 'operators', 'store_missing', 'trim', 'nullable',
+                 '_choices_cache', '_type_arity_cache')
+
     def __init__(self, name, default=None, dest=None, required=False,
                  ignore=False, type=text_type, location=('json', 'values',),
                  choices=(), action='store', help=None, operators=('=',),
@@ -91,6 +192,11 @@ class Argument(object):
         self.store_missing = store_missing
         self.trim = trim
         self.nullable = nullable
+        # The choices last looked up, whether they were case sensitive, and
+        # the containers built from them by _choice_lookup
+        self._choices_cache = (None, None, None, None)
+        # The type whose arity was last looked up, and that arity
+        self._type_arity_cache = (None, None)
 
     def __str__(self):
         if len(self.choices) > 5:
@@ -114,23 +220,68 @@ class Argument(object):
         :param request: The flask request object to parse arguments from
         """
         if isinstance(self.location, six.string_types):
-            value = getattr(request, self.location, MultiDict())
-            if callable(value):
-                value = value()
+            value = _location_values(request, self.location, MultiDict())
             if value is not None:
                 return value
         else:
             values = MultiDict()
             for l in self.location:
-                value = getattr(request, l, None)
-                if callable(value):
-                    value = value()
+                value = _location_values(request, l, None)
                 if value is not None:
                     values.update(value)
             return values
 
         return MultiDict()
 
+    def _choice_lookup(self):
+        """Returns the choices as a set, for fast lookups, and as a sequence,
+        for values that can't be hashed. Choices are lowercased if the
+        argument is not case sensitive. Both are rebuilt only when
+        :attr:`choices` or :attr:`case_sensitive` are changed.
+        """
+        choices, case_sensitive = self.choices, self.case_sensitive
+        # Subclasses that skip Argument.__init__ have no cache yet
+        cache = getattr(self, '_choices_cache', (None, None, None, None))
+        if cache[0] is choices and cache[1] == case_sensitive:
+            return cache[2], cache[3]
+
+        if isinstance(choices, six.string_types) or not hasattr(choices, '__iter__'):
+            # Containers that can only be asked about membership
+            if not case_sensitive and hasattr(choices, 'lower'):
+                choices = choices.lower()
+            lookup = sequence = choices
+        else:
+            sequence = tuple(choice.lower() if not case_sensitive and hasattr(choice, 'lower')
+                             else choice for choice in choices)
+            try:
+                lookup = frozenset(sequence)
+            except TypeError:
+                lookup = sequence
+        self._choices_cache = (self.choices, case_sensitive, lookup, sequence)
+        return lookup, sequence
+
+    def is_choice(self, value):
+        """Checks if ``value`` is one of the :attr:`choices` of this argument,
+        ignoring case if it is not case sensitive.
+
+        :param value: the converted value of the argument
+        """
+        lookup, sequence = self._choice_lookup()
+        try:
+            return value in lookup
+        except TypeError:
+            # Unhashable values, such as lists
+            return value in sequence
+
+    def _type_arity(self):
+        """Returns the number of arguments :meth:`convert` passes to
+        :attr:`type`, looked up again only if the type is changed."""
+        converter = self.type
+        cache = getattr(self, '_type_arity_cache', (None, None))
+        if cache[0] is not converter:
+            cache = self._type_arity_cache = (converter, _converter_arity(converter))
+        return cache[1]
+
     def convert(self, value, op):
         # Don't cast None
         if value is None:
@@ -144,6 +295,16 @@ class Argument(object):
         elif isinstance(value, FileStorage) and self.type == FileStorage:
             return value
 
+        arity = self._type_arity()
+        if arity == 1:
+            if self.type is decimal.Decimal:
+                return self.type(str(value))
+            return self.type(value)
+        elif arity == 2:
+            return self.type(value, self.name)
+        elif arity == 3:
+            return self.type(value, self.name, op)
+
         try:
             return self.type(value, self.name, op)
         except TypeError:
@@ -172,16 +333,20 @@ class Argument(object):
             return error, msg
         flask_restful.abort(400, message=msg)
 
-    def parse(self, request, bundle_errors=False):
+    def parse(self, request, bundle_errors=False, source=None):
         """Parses argument value(s) from the request, converting according to
         the argument's type.
 
-        :param request: The flask request object to parse arguments from
+        :param request: The flask request object to parse arguments from,
+            may be None if ``source`` is given
         :param bundle_errors: Do not abort when first error occurs, return a
             dict with the name of the argument and the error message to be
             bundled
+        :param source: The values to parse the argument from, as returned
+            by :meth:`source`. Pulled off the request if not given.
         """
-        source = self.source(request)
+        if source is None:
+            source = self.source(request)
 
         results = []
 
@@ -206,10 +371,6 @@ class Argument(object):
                     if hasattr(value, "lower") and not self.case_sensitive:
                         value = value.lower()
 
-                        if hasattr(self.choices, "__iter__"):
-                            self.choices = [choice.lower()
-                                            for choice in self.choices]
-
                     try:
                         value = self.convert(value, operator)
                     except Exception as error:
@@ -217,7 +378,7 @@ class Argument(object):
                             continue
                         return self.handle_validation_error(error, bundle_errors)
 
-                    if self.choices and value not in self.choices:
+                    if self.choices and not self.is_choice(value):
                         if current_app.config.get("BUNDLE_ERRORS", False) or bundle_errors:
                             return self.handle_validation_error(
                                 ValueError(u"{0} is not a valid choice".format(
@@ -226,7 +387,7 @@ class Argument(object):
                                 ValueError(u"{0} is not a valid choice".format(
                                     value)), bundle_errors)
 
-                    if name in request.unparsed_arguments:
+                    if request is not None and name in request.unparsed_arguments:
                         request.unparsed_arguments.pop(name)
                     results.append(value)
 
@@ -284,6 +445,8 @@ class RequestParser(object):
         self.namespace_class = namespace_class
         self.trim = trim
         self.bundle_errors = bundle_errors
+        self._plan = None
+        self._plan_args = None
 
     def add_argument(self, *args, **kwargs):
         """Adds an argument to be parsed.
@@ -318,14 +481,31 @@ class RequestParser(object):
         if req is None:
             req = request
 
+        plan = self.compile()
         namespace = self.namespace_class()
+        sources = _request_sources(req)
 
         # A record of arguments not yet parsed; as each is found
         # among self.args, it will be popped out
-        req.unparsed_arguments = dict(self.argument_class('').source(req)) if strict else {}
+        if strict:
+            strict_arg = self.argument_class('')
+            if type(strict_arg).source is Argument.source:
+                strict_source = self._source(sources, req, strict_arg,
+                                             _location_key(strict_arg.location))
+            else:
+                strict_source = strict_arg.source(req)
+            req.unparsed_arguments = dict(strict_source)
+        else:
+            req.unparsed_arguments = {}
         errors = {}
-        for arg in self.args:
-            value, found = arg.parse(req, self.bundle_errors)
+        for arg, location, key, shared in plan:
+            if shared:
+                if arg.location is not location:
+                    key = _location_key(arg.location)
+                source = self._source(sources, req, arg, key)
+                value, found = arg.parse(req, self.bundle_errors, source)
+            else:
+                value, found = arg.parse(req, self.bundle_errors)
             if isinstance(value, ValueError):
                 errors.update(found)
                 found = None
@@ -340,10 +520,110 @@ class RequestParser(object):
 
         return namespace
 
+    def parse_many(self, req=None, strict=False, http_error_code=400):
+        """Parse a JSON body holding an array of records, each of which is
+        parsed against the arguments of this parser as if it was the JSON
+        body of a request of its own. Errors are always bundled, per record
+        index, and abort the request once every record has been parsed.
+
+        The location of the arguments is not used, as all the values come
+        from the records. The values are handed to :meth:`Argument.parse`,
+        so arguments whose class overrides it can't be used.
+
+        :param req: Can be used to overwrite request from Flask
+        :param strict: if a record includes args not in parser, report it
+            as an error for that record
+        :param http_error_code: use custom error code for `flask_restful.abort()`
+        :return: a list with a :attr:`namespace_class` instance per record
+        """
+        if req is None:
+            req = request
+
+        records = req.json
+        if not isinstance(records, list):
+            flask_restful.abort(http_error_code,
+                                message=u'Expected a JSON array of records')
+
+        plan = self.compile()
+        for arg, _, _, _ in plan:
+            if type(arg).parse is not Argument.parse:
+                raise TypeError(
+                    'parse_many cannot parse %s arguments, as their class '
+                    'overrides Argument.parse' % type(arg).__name__)
+        known = set(arg.name + operator.replace('=', '', 1)
+                    for arg, _, _, _ in plan for operator in arg.operators)
+        namespace_class = self.namespace_class
+        results = []
+        errors = {}
+        for index, record in enumerate(records):
+            if not isinstance(record, dict):
+                errors[index] = u'Expected a JSON object'
+                continue
+
+            namespace = namespace_class()
+            record_errors = {}
+            for arg, _, _, _ in plan:
+                value, found = arg.parse(None, True, record)
+                if isinstance(value, ValueError):
+                    record_errors.update(found)
+                    found = None
+                if found or arg.store_missing:
+                    namespace[arg.dest or arg.name] = value
+            if strict:
+                unknown = [name for name in record if name not in known]
+                if unknown:
+                    record_errors.update(
+                        (name, u'Unknown argument') for name in unknown)
+            if record_errors:
+                errors[index] = record_errors
+            results.append(namespace)
+
+        if errors:
+            flask_restful.abort(http_error_code, message=errors)
+        return results
+
+    def compile(self):
+        """Prepares the arguments of this parser for parsing. Arguments are
+        grouped by location, so that the values of each location (say, the
+        JSON body merged with the query string) are pulled off the request
+        once per request and shared by all the arguments, and all the
+        parsers, reading from it. This happens automatically whenever the arguments
+        have changed since the last call.
+
+        Arguments whose class overrides :meth:`Argument.source` or
+        :meth:`Argument.parse` pull their values off the request themselves,
+        as before.
+        """
+        args = getattr(self, '_plan_args', None)
+        if args is None or args != self.args:
+            self._plan = tuple(
+                (arg, arg.location, _location_key(arg.location),
+                 type(arg).source is Argument.source and
+                 type(arg).parse is Argument.parse)
+                for arg in self.args
+            )
+            self._plan_args = list(self.args)
+        return self._plan
+
+    @staticmethod
+    def _source(sources, req, arg, key):
+        """Returns the values of ``arg``'s location, pulled off the request
+        only once for all the arguments reading the same location."""
+        try:
+            return sources[key]
+        except KeyError:
+            source = sources[key] = arg.source(req)
+            return source
+
     def copy(self):
-        """ Creates a copy of this RequestParser with the same set of arguments """
+        """ Creates a copy of this RequestParser with the same set of arguments
+
+        Each argument is copied, so that setting its attributes on the copy
+        does not affect this parser, but the values of those attributes
+        (types, choices, defaults...) are shared rather than copied in turn.
+        """
         parser_copy = self.__class__(self.argument_class, self.namespace_class)
-        parser_copy.args = deepcopy(self.args)
+        parser_copy.args = [copy(arg) for arg in self.args]
         parser_copy.trim = self.trim
         parser_copy.bundle_errors = self.bundle_errors
         return parser_copy
@@ -1,4 +1,5 @@
 import sys
+import threading
 
 try:
     from collections.abc import OrderedDict
@@ -33,3 +34,46 @@ def unpack(value):
         pass
 
     return value, 200, {}
+
+
+class LRUCache(object):
+    """A thread safe mapping holding at most ``maxsize`` items, which drops
+    the least recently used item when it is full.
+
+    :param int maxsize: the maximum number of items to keep
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Returns the value for ``key``, marking it as recently used, or
+        ``default`` if it is not cached."""
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                return default
+            self._data[key] = value
+            return value
+
+    def set(self, key, value):
+        """Caches ``value`` for ``key``, dropping the least recently used
+        item if the cache is full."""
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
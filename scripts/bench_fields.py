@@ -0,0 +1,107 @@
+"""Compares the memory and attribute access cost of the built-in fields and
+request arguments, which use ``__slots__``, with equivalent subclasses that
+have an instance ``__dict__``.
+
+    python scripts/bench_fields.py [--schemas N] [--number N]
+"""
+import argparse
+import timeit
+import tracemalloc
+
+from flask_restful import fields, marshal
+from flask_restful.reqparse import Argument
+
+
+class DictString(fields.String):
+    pass
+
+
+class DictInteger(fields.Integer):
+    pass
+
+
+class DictNested(fields.Nested):
+    pass
+
+
+class DictArgument(Argument):
+    pass
+
+
+def build_schemas(count, string, integer, nested):
+    return [{
+        'id': integer(),
+        'name': string(attribute='full_name'),
+        'email': string(),
+        'address': nested({'street': string(), 'city': string(), 'zip': integer()}),
+    } for _ in range(count)]
+
+
+def build_arguments(count, argument):
+    return [argument('arg%d' % i, type=int, choices=(1, 2, 3)) for i in range(count)]
+
+
+def allocated(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del objects
+    return size
+
+
+def report(label, slotted, with_dict):
+    print('%-32s %10.1f %10.1f %7.2fx' % (label, slotted, with_dict, with_dict / slotted))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark field and argument memory use')
+    parser.add_argument('--schemas', type=int, default=10000)
+    parser.add_argument('--number', type=int, default=1000000)
+    args = parser.parse_args()
+
+    print('%-32s %10s %10s %8s' % ('', 'slots', '__dict__', 'ratio'))
+
+    slotted = allocated(lambda: build_schemas(
+        args.schemas, fields.String, fields.Integer, fields.Nested))
+    with_dict = allocated(lambda: build_schemas(
+        args.schemas, DictString, DictInteger, DictNested))
+    report('bytes per schema', slotted / float(args.schemas),
+           with_dict / float(args.schemas))
+
+    slotted = allocated(lambda: build_arguments(args.schemas, Argument))
+    with_dict = allocated(lambda: build_arguments(args.schemas, DictArgument))
+    report('bytes per argument', slotted / float(args.schemas),
+           with_dict / float(args.schemas))
+
+    for label, slotted_obj, dict_obj, attribute in [
+        ('ns per field.default', fields.String(), DictString(), 'default'),
+        ('ns per argument.type', Argument('foo'), DictArgument('foo'), 'type'),
+    ]:
+        timings = [
+            timeit.timeit('obj.%s' % attribute, globals={'obj': obj}, number=args.number)
+            for obj in (slotted_obj, dict_obj)
+        ]
+        report(label, *[t * 1e9 / args.number for t in timings])
+
+    obj = {'id': 1, 'full_name': 'Jane', 'email': 'jane@example.com',
+           'address': {'street': 'Main St', 'city': 'Springfield', 'zip': 12345}}
+    timings = []
+    for schema in (build_schemas(1, fields.String, fields.Integer, fields.Nested)[0],
+                   build_schemas(1, DictString, DictInteger, DictNested)[0]):
+        marshaller = marshal.compile(schema)
+        timings.append(timeit.timeit(lambda: marshaller(obj), number=args.number // 10))
+    report('us per marshalled record', *[t * 1e6 / (args.number // 10) for t in timings])
+
+    # List items are output with a new index each time
+    obj = {'tags': ['tag%d' % i for i in range(50)]}
+    timings = []
+    for string in (fields.String, DictString):
+        marshaller = marshal.compile({'tags': fields.List(string)})
+        timings.append(timeit.timeit(lambda: marshaller(obj), number=args.number // 100))
+    report('us per list of 50 strings', *[t * 1e6 / (args.number // 100) for t in timings])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Compares parsing ISO 8601 datetimes and intervals with aniso8601 alone
+against the parsers in flask_restful.inputs.
+
+    python scripts/bench_inputs.py [--number N]
+"""
+import argparse
+import timeit
+
+import aniso8601
+
+from flask_restful import inputs
+
+
+DATETIMES = [
+    '2012-01-01T23:30:00',
+    '2012-01-01T23:30:00Z',
+    '2012-01-01T23:30:00+02:00',
+    '2012-01-01T23:30:00.123456+02:00',
+    '2012-01-01T23:30',
+    '20120101T233000',
+]
+
+INTERVALS = [
+    '2013-01-01',
+    '2013-01-01T12',
+    '2013-01-01/2013-02-28',
+    '2013-01-01T12:00/PT30M',
+    '2013-01-01T06:00:00Z/2013-01-01T12:00:00Z',
+    '2013-01-01/P1M',
+]
+
+
+def aniso8601_interval(value):
+    start, end = inputs._parse_interval(value)
+    if end is None:
+        end = inputs._expand_datetime(start, value)
+    return inputs._normalize_interval(start, end, value)
+
+
+def uncached_interval(value):
+    inputs._interval_cache.clear()
+    return inputs.iso8601interval(value)
+
+
+def report(value, timings, number):
+    baseline = timings[0]
+    print('%-44s' % value + ''.join(
+        '%10.2f %6.1fx' % (t * 1e6 / number, baseline / t) for t in timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ISO 8601 input parsing')
+    parser.add_argument('--number', type=int, default=20000)
+    args = parser.parse_args()
+
+    print('%-44s%17s%18s' % ('datetime_from_iso8601 (us)', 'aniso8601', 'inputs'))
+    for value in DATETIMES:
+        timings = [timeit.timeit(lambda: parse(value), number=args.number)
+                   for parse in (aniso8601.parse_datetime, inputs.datetime_from_iso8601)]
+        report(value, timings, args.number)
+
+    print('')
+    print('%-44s%17s%18s%18s' % ('iso8601interval (us)', 'aniso8601', 'uncached', 'cached'))
+    for value in INTERVALS:
+        timings = [timeit.timeit(lambda: parse(value), number=args.number)
+                   for parse in (aniso8601_interval, uncached_interval, inputs.iso8601interval)]
+        report(value, timings, args.number)
+
+
+if __name__ == '__main__':
+    main()
@@ -238,3 +238,35 @@ class AcceptTestCase(unittest.TestCase):
         with app.test_client() as client:
             res = client.get('/', headers=[('Accept', 'text/plain')])
             self.assertEqual(res.status_code, 500)
+
+    def test_accept_cached_negotiation(self):
+
+        class Foo(flask_restful.Resource):
+            def get(self):
+                return "data"
+
+        app = Flask(__name__)
+        api = flask_restful.Api(app, default_mediatype=None)
+
+        api.add_resource(Foo, '/')
+
+        with app.test_client() as client:
+            res = client.get('/', headers=[('Accept', 'text/plain')])
+            self.assertEqual(res.status_code, 406)
+
+            @api.representation('text/plain')
+            def text_rep(data, status_code, headers=None):
+                return app.make_response((str(data), status_code, headers))
+
+            res = client.get('/', headers=[('Accept', 'text/plain')])
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.content_type, 'text/plain')
+
+            cached = len(api._negotiation_cache)
+            res = client.get('/', headers=[('Accept', 'text/plain')])
+            self.assertEqual(res.content_type, 'text/plain')
+            self.assertEqual(len(api._negotiation_cache), cached)
+
+            api.representations = {}
+            res = client.get('/', headers=[('Accept', 'text/plain')])
+            self.assertEqual(res.status_code, 406)
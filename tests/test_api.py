@@ -1,5 +1,7 @@
 import unittest
 import json
+from datetime import datetime
+from functools import wraps
 from flask import Flask, Blueprint, redirect, views, abort as flask_abort
 from flask.signals import got_request_exception, signals_available
 try:
@@ -264,6 +266,197 @@ class APITestCase(unittest.TestCase):
         output = flask_restful.marshal((marshal_fields,), fields, envelope='hey')
         self.assertEqual(output, {'hey': [{'foo': 'bar'}]})
 
+    def test_marshal_compiled_schema(self):
+        fields = OrderedDict([
+            ('foo', flask_restful.fields.Raw),
+            ('fee', OrderedDict([('fye', flask_restful.fields.String)])),
+        ])
+        schema = flask_restful.marshal.compile(fields)
+        self.assertTrue(isinstance(schema, flask_restful.CompiledSchema))
+
+        data = [{'foo': 'bar', 'fye': 1}, {'foo': 'baz', 'fye': 2}]
+        expected = [flask_restful.marshal(d, fields) for d in data]
+        self.assertEqual(schema(data), expected)
+        self.assertEqual(flask_restful.marshal(data, schema), expected)
+        self.assertEqual(schema(data, envelope='hey'), {'hey': expected})
+        self.assertEqual(schema(data[0]), {'foo': 'bar', 'fee': {'fye': '1'}})
+
+    def test_marshal_compiled_schema_instantiates_fields_once(self):
+        instances = []
+
+        class Counted(flask_restful.fields.Raw):
+            def __init__(self, *args, **kwargs):
+                super(Counted, self).__init__(*args, **kwargs)
+                instances.append(self)
+
+        fields = {'foo': Counted}
+        flask_restful.marshal([{'foo': 1}, {'foo': 2}, {'foo': 3}], fields)
+        self.assertEqual(len(instances), 1)
+
+    def test_marshal_generated_schema(self):
+        fields = OrderedDict([
+            ('id', flask_restful.fields.Integer),
+            ('name', flask_restful.fields.String(attribute='person.name')),
+            ('score', flask_restful.fields.Float(default=1.5)),
+            ('active', flask_restful.fields.Boolean),
+            ('tags', flask_restful.fields.List(flask_restful.fields.String)),
+            ('extra', OrderedDict([('active', flask_restful.fields.Boolean)])),
+        ])
+        schema = flask_restful.marshal.compile(fields, generate=True)
+        self.assertTrue('def marshal_one(obj):' in schema.source)
+        self.assertTrue(flask_restful.marshal.compile(fields, generate=True) is schema)
+
+        class Person(object):
+            name = 'bob'
+
+        data = [
+            {'id': '3', 'person': {'name': 'alice'}, 'active': 1, 'tags': [1, 'a']},
+            {'id': None, 'person': Person(), 'score': '2.5'},
+            SimpleNamespace(id=4, person=None, active=False, tags=()),
+        ]
+        expected = [flask_restful.marshal(d, fields) for d in data]
+        self.assertEqual(schema(data), expected)
+
+    def test_marshal_generated_schema_changed_fields(self):
+        fields = {'a': flask_restful.fields.Raw, 'nested': {'b': flask_restful.fields.Raw}}
+        data = {'a': 1, 'b': 2, 'c': 3}
+        schema = flask_restful.marshal.compile(fields, generate=True, ordered=False)
+        self.assertEqual(schema(data), {'a': 1, 'nested': {'b': 2}})
+
+        fields['b'] = flask_restful.fields.Raw
+        fields['nested']['c'] = flask_restful.fields.Raw
+        schema = flask_restful.marshal.compile(fields, generate=True, ordered=False)
+        self.assertEqual(schema(data), {'a': 1, 'b': 2, 'nested': {'b': 2, 'c': 3}})
+        self.assertTrue(flask_restful.marshal.compile(fields, generate=True, ordered=False) is schema)
+
+    def test_marshal_generated_schema_wraps_format_errors(self):
+        fields = {'id': flask_restful.fields.Integer}
+        schema = flask_restful.marshal.compile(fields, generate=True)
+        self.assertRaises(flask_restful.fields.MarshallingException,
+                          schema, {'id': 'abc'})
+
+    def test_marshal_unordered(self):
+        fields = OrderedDict([('foo', flask_restful.fields.Raw),
+                              ('bar', {'baz': flask_restful.fields.Integer})])
+        marshal_dict = {'foo': 'bar', 'baz': '1'}
+        expected = {'foo': 'bar', 'bar': {'baz': 1}}
+
+        for output in (flask_restful.marshal(marshal_dict, fields, ordered=False),
+                       flask_restful.marshal([marshal_dict], fields, ordered=False)[0],
+                       flask_restful.marshal([marshal_dict], fields, batch=True, ordered=False)[0],
+                       flask_restful.marshal.compile(fields, generate=True, ordered=False)(marshal_dict)):
+            self.assertEqual(output, expected)
+            self.assertEqual(type(output), dict)
+            self.assertEqual(type(output['bar']), dict)
+
+        output = flask_restful.marshal(marshal_dict, fields, envelope='data', ordered=False)
+        self.assertEqual(type(output), dict)
+        self.assertNotEqual(flask_restful.marshal.compile(fields, generate=True),
+                            flask_restful.marshal.compile(fields, generate=True, ordered=False))
+
+    def test_marshal_unordered_config(self):
+        app = Flask(__name__)
+        app.config['RESTFUL_MARSHAL_ORDERED'] = False
+        fields = {'foo': flask_restful.fields.Raw}
+
+        with app.app_context():
+            self.assertEqual(type(flask_restful.marshal({'foo': 1}, fields)), dict)
+            self.assertEqual(type(flask_restful.marshal({'foo': 1}, fields, ordered=True)),
+                             OrderedDict)
+        self.assertEqual(type(flask_restful.marshal({'foo': 1}, fields)), OrderedDict)
+
+    def test_marshal_unordered_nested(self):
+        nested = flask_restful.fields.Nested({'baz': flask_restful.fields.Integer})
+        fields = OrderedDict([('one', nested),
+                              ('many', flask_restful.fields.List(nested)),
+                              ('rows', flask_restful.fields.List(flask_restful.fields.List(nested)))])
+        marshal_dict = {'one': {'baz': '1'}, 'many': [{'baz': 2}], 'rows': [[{'baz': 3}]]}
+
+        # Compiled with the default settings first
+        self.assertEqual(type(flask_restful.marshal(marshal_dict, fields)['one']), OrderedDict)
+
+        for output in (flask_restful.marshal(marshal_dict, fields, ordered=False),
+                       flask_restful.marshal([marshal_dict], fields, ordered=False)[0],
+                       flask_restful.marshal([marshal_dict], fields, batch=True, ordered=False)[0],
+                       flask_restful.marshal.compile(fields, generate=True, ordered=False)(marshal_dict)):
+            self.assertEqual(output, {'one': {'baz': 1}, 'many': [{'baz': 2}], 'rows': [[{'baz': 3}]]})
+            self.assertEqual(type(output['one']), dict)
+            self.assertEqual(type(output['many'][0]), dict)
+            self.assertEqual(type(output['rows'][0][0]), dict)
+
+        app = Flask(__name__)
+        app.config['RESTFUL_MARSHAL_ORDERED'] = False
+        with app.app_context():
+            output = flask_restful.marshal(marshal_dict, fields)
+            self.assertEqual(type(output['one']), dict)
+            self.assertEqual(type(output['many'][0]), dict)
+
+        output = flask_restful.marshal(marshal_dict, fields)
+        self.assertEqual(type(output['one']), OrderedDict)
+        self.assertEqual(type(output['rows'][0][0]), OrderedDict)
+
+    def test_marshal_batch(self):
+        fields = OrderedDict([
+            ('id', flask_restful.fields.Integer),
+            ('score', flask_restful.fields.Float(default=1.5)),
+            ('active', flask_restful.fields.Boolean),
+            ('name', flask_restful.fields.String(attribute='person.name')),
+            ('greeting', flask_restful.fields.FormattedString('Hi {id}')),
+            ('extra', OrderedDict([('active', flask_restful.fields.Boolean)])),
+        ])
+        data = [
+            {'id': '3', 'person': {'name': 'alice'}, 'active': 1, 'score': 2},
+            {'id': None, 'person': None, 'active': '', 'score': None},
+        ]
+        expected = flask_restful.marshal(data, fields)
+        self.assertEqual(flask_restful.marshal(data, fields, batch=True), expected)
+        self.assertEqual(flask_restful.marshal([], fields, batch=True), [])
+        self.assertRaises(flask_restful.fields.MarshallingException,
+                          flask_restful.marshal, [{'id': 'x'}], fields, batch=True)
+
+    def test_marshal_batch_columns(self):
+        fields = OrderedDict([
+            ('id', flask_restful.fields.Integer),
+            ('name', flask_restful.fields.String),
+            ('missing', flask_restful.fields.Integer),
+            ('greeting', flask_restful.fields.FormattedString('Hi {name}')),
+        ])
+        columns = {'id': ['1', 2], 'name': ['alice', 'bob']}
+        rows = [{'id': '1', 'name': 'alice'}, {'id': 2, 'name': 'bob'}]
+        self.assertEqual(flask_restful.marshal(columns, fields, batch=True),
+                         flask_restful.marshal(rows, fields))
+
+    def test_marshal_batch_numpy(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest('NumPy is not installed')
+
+        fields = OrderedDict([
+            ('id', flask_restful.fields.Integer),
+            ('score', flask_restful.fields.Float),
+            ('active', flask_restful.fields.Boolean),
+            ('name', flask_restful.fields.String),
+        ])
+        data = numpy.array([(1, 2.5, True, 'a'), (2, 3, False, 'b')], dtype=[
+            ('id', 'i8'), ('score', 'f4'), ('active', '?'), ('name', 'U5')])
+        output = flask_restful.marshal(data, fields, batch=True)
+        self.assertEqual(output, [
+            {'id': 1, 'score': 2.5, 'active': True, 'name': 'a'},
+            {'id': 2, 'score': 3.0, 'active': False, 'name': 'b'},
+        ])
+        self.assertTrue(all(type(record['id']) is int for record in output))
+
+    def test_marshal_decorator_compiles_lazily(self):
+        fields = OrderedDict([('foo', flask_restful.fields.Raw)])
+
+        @flask_restful.marshal_with(fields)
+        def try_me():
+            return OrderedDict([('foo', 'bar'), ('bat', 'baz')])
+
+        fields['bat'] = flask_restful.fields.Raw
+        self.assertEqual(try_me(), {'foo': 'bar', 'bat': 'baz'})
+
     def test_marshal_nested(self):
         fields = OrderedDict([
             ('foo', flask_restful.fields.Raw),
@@ -372,6 +565,17 @@ class APITestCase(unittest.TestCase):
         expected = OrderedDict([('foo', 'bar'), ('fee', [['fye'], ['fum']])])
         self.assertEqual(output, expected)
 
+    def test_marshal_nested_list_of_records(self):
+        fields = {'a': flask_restful.fields.Raw}
+        data = [[{'a': 1}, {'a': 2}], [], ({'a': 3},), {'a': 4}]
+        expected = [[OrderedDict([('a', 1)]), OrderedDict([('a', 2)])], [],
+                    [OrderedDict([('a', 3)])], OrderedDict([('a', 4)])]
+        self.assertEqual(flask_restful.marshal(data, fields), expected)
+        self.assertEqual(flask_restful.marshal(data, fields, batch=True), expected)
+        self.assertEqual(flask_restful.marshal.compile(fields, generate=True)(data), expected)
+        self.assertEqual(flask_restful.marshal([[{'a': 1}]], fields, envelope='x'),
+                         OrderedDict([('x', [[OrderedDict([('a', 1)])]])]))
+
     def test_marshal_nested_dict(self):
         fields = OrderedDict([
             ('foo', flask_restful.fields.Raw),
@@ -790,6 +994,34 @@ class APITestCase(unittest.TestCase):
         with app.test_request_context('/ids/3'):
             self.assertTrue(api._has_fr_route())
 
+    def test_error_routing_uses_matched_route(self):
+        app = Flask(__name__)
+        api = flask_restful.Api(app)
+        api.add_resource(HelloWorld, '/ids/<int:id>', endpoint="hello")
+
+        with app.test_request_context('/ids/3', method='POST'):
+            with patch.object(app, 'create_url_adapter', wraps=app.create_url_adapter) as create:
+                self.assertTrue(api._has_fr_route())
+                self.assertTrue(api._has_fr_route())
+            self.assertEqual(create.call_count, 1)
+
+        with app.test_request_context('/ids/3', method='POST'):
+            with patch.object(app, 'create_url_adapter') as create:
+                self.assertTrue(api._has_fr_route())
+            self.assertFalse(create.called)
+
+        with app.test_request_context('/ids/3'):
+            with patch.object(app, 'create_url_adapter') as create:
+                self.assertTrue(api._has_fr_route())
+            self.assertFalse(create.called)
+
+        @app.route('/other')
+        def other():
+            return 'other'
+
+        with app.test_request_context('/other', method='POST'):
+            self.assertFalse(api._has_fr_route())
+
     def test_url_for(self):
         app = Flask(__name__)
         api = flask_restful.Api(app)
@@ -957,6 +1189,242 @@ class APITestCase(unittest.TestCase):
         expected = b'{"foo": "bar"}\n'
         self.assertEqual(data, expected)
 
+    def test_json_debug_does_not_change_config(self):
+        app = Flask(__name__)
+        app.config['RESTFUL_JSON'] = settings = {'sort_keys': True}
+        app.debug = True
+        api = flask_restful.Api(app)
+
+        class Foo(flask_restful.Resource):
+            def get(self):
+                return {'foo': 'bar'}
+
+        api.add_resource(Foo, '/foo')
+
+        with app.test_client() as client:
+            self.assertEqual(client.get('/foo').data, b'{\n    "foo": "bar"\n}\n')
+            self.assertEqual(settings, {'sort_keys': True})
+
+            app.debug = False
+            self.assertEqual(client.get('/foo').data, b'{"foo": "bar"}\n')
+
+    def test_json_backend(self):
+        try:
+            import orjson  # noqa
+        except ImportError:
+            self.skipTest('orjson is not installed')
+
+        app = Flask(__name__)
+        app.config['RESTFUL_JSON_BACKEND'] = 'orjson'
+        api = flask_restful.Api(app)
+
+        class Foo(flask_restful.Resource):
+            def get(self):
+                return OrderedDict([('foo', 'bar'), (1, 2 ** 70)])
+
+        api.add_resource(Foo, '/foo')
+
+        with app.test_client() as client:
+            self.assertEqual(client.get('/foo').data,
+                             b'{"foo": "bar", "1": 1180591620717411303424}\n')
+
+            app.config['RESTFUL_JSON_BACKEND'] = 'auto'
+            with patch.object(Foo, 'get', lambda self: {'foo': 'bar'}):
+                self.assertEqual(client.get('/foo').data, b'{"foo":"bar"}\n')
+
+    def test_json_backend_unsupported_settings(self):
+        app = Flask(__name__)
+        app.config['RESTFUL_JSON_BACKEND'] = 'orjson'
+        app.config['RESTFUL_JSON'] = {'cls': JSONEncoder, 'indent': 1}
+
+        with app.app_context():
+            with patch('warnings.warn') as warn:
+                encoders = flask_restful.representations.json.get_encoders(app)
+            self.assertTrue(warn.called)
+            self.assertEqual(encoders.body({'foo': 'bar'}), b'{\n "foo": "bar"\n}\n')
+
+        app.config['RESTFUL_JSON_BACKEND'] = 'msgpack'
+        self.assertRaises(ValueError, flask_restful.representations.json.get_encoders, app)
+
+    def test_marshal_with_stream(self):
+        app = Flask(__name__)
+        api = flask_restful.Api(app)
+        produced = []
+        fields = OrderedDict([('id', flask_restful.fields.Integer)])
+
+        def records():
+            for i in range(3):
+                produced.append(i)
+                yield {'id': str(i), 'secret': 'x'}
+
+        class Foo(flask_restful.Resource):
+            @flask_restful.marshal_with(fields, stream=True)
+            def get(self):
+                return records()
+
+        class Bar(flask_restful.Resource):
+            @flask_restful.marshal_with(fields, envelope='data', batch=True, stream=True)
+            def get(self):
+                return records(), 201, {'X-Stream': 'yes'}
+
+        api.add_resource(Foo, '/foo')
+        api.add_resource(Bar, '/bar')
+
+        with app.test_request_context('/foo'):
+            stream = Foo().get()
+            self.assertTrue(isinstance(stream, flask_restful.MarshalledStream))
+            self.assertEqual(produced, [])
+
+        with app.test_client() as client:
+            resp = client.get('/foo')
+            self.assertTrue(resp.is_streamed)
+            self.assertEqual(resp.get_data(), b'[{"id": 0}, {"id": 1}, {"id": 2}]\n')
+            self.assertEqual(resp.content_type, 'application/json')
+
+            resp = client.get('/bar')
+            self.assertEqual(resp.status_code, 201)
+            self.assertEqual(resp.headers['X-Stream'], 'yes')
+            self.assertEqual(json.loads(resp.data.decode()),
+                             {'data': [{'id': 0}, {'id': 1}, {'id': 2}]})
+
+    def test_ndjson(self):
+        app = Flask(__name__)
+        app.debug = True
+        api = flask_restful.Api(app)
+        api.representation('application/x-ndjson')(flask_restful.representations.json.output_ndjson)
+        fields = OrderedDict([('id', flask_restful.fields.Integer)])
+
+        class Foo(flask_restful.Resource):
+            @flask_restful.marshal_with(fields, envelope='data', stream=True)
+            def get(self):
+                return ({'id': i} for i in range(3))
+
+        class Bar(flask_restful.Resource):
+            def get(self):
+                return {'id': 1}, 201
+
+        api.add_resource(Foo, '/foo')
+        api.add_resource(Bar, '/bar')
+        headers = {'Accept': 'application/x-ndjson'}
+
+        with app.test_client() as client:
+            resp = client.get('/foo', headers=headers)
+            self.assertTrue(resp.is_streamed)
+            self.assertEqual(resp.content_type, 'application/x-ndjson')
+            self.assertEqual(resp.get_data(), b'{"id": 0}\n{"id": 1}\n{"id": 2}\n')
+
+            resp = client.get('/bar', headers=headers)
+            self.assertEqual(resp.status_code, 201)
+            self.assertEqual(resp.get_data(), b'{"id": 1}\n')
+
+            # Still indented for JSON in debug mode
+            self.assertEqual(client.get('/bar').get_data(), b'{\n    "id": 1\n}\n')
+
+        with app.test_request_context('/'):
+            records = ({'id': i, 'name': 'x' * 100} for i in range(2000))
+            resp = flask_restful.representations.json.output_ndjson(records, 200)
+            chunks = list(resp.response)
+            self.assertTrue(len(chunks) > 1)
+            lines = b''.join(chunks).splitlines()
+            self.assertEqual(len(lines), 2000)
+            self.assertEqual(json.loads(lines[-1].decode()), {'id': 1999, 'name': 'x' * 100})
+
+    def test_etag(self):
+        app = Flask(__name__)
+        api = flask_restful.Api(app, etag=True)
+
+        class Foo(flask_restful.Resource):
+            def get(self):
+                return {'foo': 'bar'}
+
+            def post(self):
+                return {'foo': 'bar'}
+
+        api.add_resource(Foo, '/foo')
+
+        with app.test_client() as client:
+            resp = client.get('/foo')
+            etag, weak = unquote_etag(resp.headers['ETag'])
+            self.assertFalse(weak)
+
+            resp = client.get('/foo', headers={'If-None-Match': quote_etag(etag)})
+            self.assertEqual(resp.status_code, 304)
+            self.assertEqual(resp.data, b'')
+
+            resp = client.get('/foo', headers={'If-None-Match': quote_etag('other')})
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(loads(resp.data.decode()), {'foo': 'bar'})
+
+            self.assertFalse('ETag' in client.post('/foo').headers)
+
+        api.etag = 'weak'
+        with app.test_client() as client:
+            self.assertEqual(client.get('/foo').headers['ETag'], quote_etag(etag, True))
+
+    def test_resource_version(self):
+        app = Flask(__name__)
+        api = flask_restful.Api(app)
+        calls = []
+
+        def authenticate(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not flask.request.headers.get('Authorization'):
+                    flask_restful.abort(401)
+                return func(*args, **kwargs)
+            return wrapper
+
+        class Foo(flask_restful.Resource):
+            method_decorators = [authenticate]
+
+            def get_etag(self, id):
+                return 'v%d' % id, True
+
+            def get_last_modified(self, id):
+                return datetime(2020, 1, id)
+
+            def get(self, id):
+                calls.append(id)
+                return {'id': id}
+
+        api.add_resource(Foo, '/foo/<int:id>')
+        auth = {'Authorization': 'yes'}
+
+        with app.test_client() as client:
+            resp = client.get('/foo/1', headers=dict(auth, **{'If-None-Match': 'W/"v1"'}))
+            self.assertEqual(resp.status_code, 304)
+            self.assertEqual(resp.headers['ETag'], 'W/"v1"')
+            self.assertEqual(calls, [])
+
+            resp = client.get('/foo/1', headers={'If-None-Match': 'W/"v1"'})
+            self.assertEqual(resp.status_code, 401)
+
+            resp = client.get('/foo/2', headers=dict(auth, **{'If-None-Match': 'W/"v1"'}))
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.headers['ETag'], 'W/"v2"')
+            self.assertEqual(resp.headers['Last-Modified'], 'Thu, 02 Jan 2020 00:00:00 GMT')
+            self.assertEqual(loads(resp.data.decode()), {'id': 2})
+            self.assertEqual(calls, [2])
+
+            resp = client.get('/foo/2', headers=dict(
+                auth, **{'If-Modified-Since': 'Fri, 03 Jan 2020 00:00:00 GMT'}))
+            self.assertEqual(resp.status_code, 304)
+            self.assertEqual(calls, [2])
+
+    def test_marshal_with_stream_empty(self):
+        app = Flask(__name__)
+        api = flask_restful.Api(app)
+
+        class Foo(flask_restful.Resource):
+            @flask_restful.marshal_with({'id': flask_restful.fields.Integer}, stream=True)
+            def get(self):
+                return iter([])
+
+        api.add_resource(Foo, '/foo')
+
+        with app.test_client() as client:
+            self.assertEqual(client.get('/foo').data, b'[]\n')
+
     def test_redirect(self):
         app = Flask(__name__)
         api = flask_restful.Api(app)
@@ -1089,6 +1557,102 @@ class APITestCase(unittest.TestCase):
         assert r.get() == 'get test'
         assert r.post() == 'post test'
 
+    def test_method_decorators_composed_once(self):
+        applied = []
+
+        def upper_deco(f):
+            applied.append(f)
+
+            def upper(*args, **kwargs):
+                if not getattr(f, 'shout', True):
+                    return f(*args, **kwargs)
+                return f(*args, **kwargs).upper()
+            return upper
+
+        class TestResource(flask_restful.Resource):
+            method_decorators = [upper_deco]
+            compose_decorators = True
+
+            def __init__(self, who):
+                self.who = who
+
+            def get(self, suffix):
+                return 'get %s%s' % (self.who, suffix)
+
+            def post(self, suffix):
+                return 'post test'
+            post.shout = False
+
+        app = Flask(__name__)
+        api = flask_restful.Api(app)
+        api.add_resource(TestResource, '/<suffix>', resource_class_kwargs={'who': 'test'})
+        self.assertEqual(len(applied), 2)
+
+        with app.test_client() as client:
+            for _ in range(3):
+                self.assertEqual(client.get('/!').data, b'"GET TEST!"\n')
+            self.assertEqual(client.post('/!').data, b'"post test"\n')
+        self.assertEqual(len(applied), 2)
+        self.assertEqual(set(f.__name__ for f in applied), set(['get', 'post']))
+
+        with app.test_request_context('/', method='GET'):
+            resource = TestResource('other')
+            resource.method_decorators = []
+            self.assertEqual(resource.dispatch_request('?'), 'get other?')
+
+            TestResource.method_decorators = []
+            self.assertEqual(TestResource('test').dispatch_request('?'), 'get test?')
+
+    def test_method_decorators_bound(self):
+        def lazy(f):
+            def wrapper(*args, **kwargs):
+                return lambda: (f.__self__.who, f(*args, **kwargs))
+            return wrapper
+
+        class TestResource(flask_restful.Resource):
+            method_decorators = [lazy]
+
+            def __init__(self, who):
+                self.who = who
+
+            def get(self):
+                return 'get'
+
+        app = Flask(__name__)
+        api = flask_restful.Api(app)
+        api.add_resource(TestResource, '/', resource_class_kwargs={'who': 'test'})
+
+        with app.test_request_context('/'):
+            self.assertEqual(TestResource('test').dispatch_request()(), ('test', 'get'))
+            self.assertFalse('_method_chains' in TestResource.__dict__)
+
+    def test_method_decorators_head(self):
+        calls = []
+
+        def record(name):
+            def decorator(f):
+                def wrapper(*args, **kwargs):
+                    calls.append(name)
+                    return f(*args, **kwargs)
+                return wrapper
+            return decorator
+
+        class TestResource(flask_restful.Resource):
+            method_decorators = {'get': [record('get')], 'head': [record('head')]}
+
+            def get(self):
+                return 'get'
+
+        app = Flask(__name__)
+        api = flask_restful.Api(app)
+        api.add_resource(TestResource, '/')
+
+        with app.test_client() as client:
+            self.assertEqual(client.head('/').status_code, 200)
+            self.assertEqual(calls, ['head'])
+            client.get('/')
+            self.assertEqual(calls, ['head', 'get'])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,172 @@
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+import binascii
+import unittest
+
+from flask import Flask
+import pytz
+import flask_restful
+from flask_restful import fields
+from flask_restful.representations import cbor, msgpack
+from flask_restful.representations.cbor import output_cbor
+from flask_restful.representations.msgpack import output_msgpack
+
+
+def unhexlify(data):
+    return binascii.unhexlify(data.replace(' ', ''))
+
+
+VALUES = [
+    0, 1, 23, 24, 127, 128, 255, 256, 65535, 65536, 2 ** 32, 2 ** 63,
+    -1, -32, -33, -128, -129, -32768, -32769, -2 ** 31 - 1, -2 ** 63,
+    1.5, -0.0, None, True, False,
+    u'', u'a' * 31, u'a' * 32, u'ü' * 200, u'b' * 70000,
+    b'', b'\x00' * 300,
+    [], [1, [2, [3]]], list(range(70000)),
+    {}, {u'a': 1, u'b': [u'c', {u'd': None}]},
+]
+
+
+class MessagePackTestCase(unittest.TestCase):
+
+    def test_round_trip(self):
+        for value in VALUES:
+            self.assertEqual(msgpack.unpack(msgpack.pack(value)), value)
+
+    def test_pack(self):
+        # Examples from the MessagePack specification
+        self.assertEqual(msgpack.pack(OrderedDict([(u'compact', True), (u'schema', 0)])),
+                         unhexlify('82 a7 636f6d70616374 c3 a6 736368656d61 00'))
+        self.assertEqual(msgpack.pack(-33), unhexlify('d0 df'))
+        self.assertEqual(msgpack.pack(2 ** 63), unhexlify('cf 8000000000000000'))
+        self.assertRaises(OverflowError, msgpack.pack, 2 ** 64)
+        self.assertRaises(TypeError, msgpack.pack, object())
+
+    def test_timestamp(self):
+        self.assertEqual(msgpack.pack(datetime(1970, 1, 1, 0, 0, 1)), unhexlify('d6 ff 00000001'))
+        for value in (datetime(2019, 1, 2, 3, 4, 5, 678901, tzinfo=pytz.UTC),
+                      datetime(2600, 1, 1, tzinfo=pytz.UTC),
+                      datetime(1900, 1, 1, tzinfo=pytz.UTC)):
+            self.assertEqual(msgpack.unpack(msgpack.pack(value)), value)
+
+        paris = pytz.timezone('Europe/Paris').localize(datetime(2019, 1, 2, 3, 4, 5))
+        self.assertEqual(msgpack.unpack(msgpack.pack(paris)), paris)
+
+    def test_default(self):
+        self.assertEqual(msgpack.unpack(msgpack.pack(Decimal('1.10'))), u'1.10')
+        self.assertEqual(msgpack.unpack(msgpack.pack(date(2019, 1, 2))), u'2019-01-02')
+
+    def test_invalid(self):
+        for data in (b'', b'\xc1', b'\x92\x01', b'\x01\x02', b'\x81\x90\x01', b'\xd4\x05\x00',
+                     b'\xa2\xff\xfe', b'\x91' * 100000):
+            self.assertRaises(ValueError, msgpack.unpack, data)
+            self.assertRaises(ValueError, msgpack.loads, data)
+
+
+class CBORTestCase(unittest.TestCase):
+
+    def test_round_trip(self):
+        for value in VALUES + [2 ** 64, -2 ** 64 - 1, 2 ** 100]:
+            self.assertEqual(cbor.decode(cbor.encode(value)), value)
+
+    def test_encode(self):
+        # Examples from RFC 8949, appendix A
+        self.assertEqual(cbor.encode(1000000), unhexlify('1a 000f4240'))
+        self.assertEqual(cbor.encode(-1000), unhexlify('39 03e7'))
+        self.assertEqual(cbor.encode(2 ** 64), unhexlify('c2 49 010000000000000000'))
+        self.assertEqual(cbor.encode(OrderedDict([(u'a', 1), (u'b', [2, 3])])),
+                         unhexlify('a2 61 61 01 61 62 82 02 03'))
+        self.assertEqual(cbor.encode(datetime(2013, 3, 21, 20, 4, 0)),
+                         unhexlify('c0 74 323031332d30332d32315432303a30343a30305a'))
+        self.assertEqual(cbor.encode(Decimal('273.15')), unhexlify('c4 82 21 19 6ab3'))
+        self.assertRaises(TypeError, cbor.encode, object())
+
+    def test_decode(self):
+        # Examples from RFC 8949, appendix A
+        self.assertEqual(cbor.decode(unhexlify('f9 3c00')), 1.0)
+        self.assertEqual(cbor.decode(unhexlify('f9 c400')), -4.0)
+        self.assertEqual(cbor.decode(unhexlify('f9 7c00')), float('inf'))
+        self.assertEqual(cbor.decode(unhexlify('fa 47c35000')), 100000.0)
+        self.assertEqual(cbor.decode(unhexlify('c1 1a 514b67b0')),
+                         datetime(2013, 3, 21, 20, 4, 0, tzinfo=pytz.UTC))
+        self.assertEqual(cbor.decode(unhexlify('c3 49 010000000000000000')), -2 ** 64 - 1)
+        self.assertEqual(cbor.decode(unhexlify('9f 01 82 02 03 9f 04 05 ff ff')), [1, [2, 3], [4, 5]])
+        self.assertEqual(cbor.decode(unhexlify('bf 61 61 01 61 62 9f 02 03 ff ff')),
+                         {u'a': 1, u'b': [2, 3]})
+        self.assertEqual(cbor.decode(unhexlify('7f 65 7374726561 64 6d696e67 ff')), u'streaming')
+        self.assertEqual(cbor.decode(unhexlify('d8 64 19 0f9a')), date(1980, 12, 8))
+
+    def test_native_types(self):
+        value = [Decimal('-12.3400'), Decimal('1E+30'), date(2020, 1, 2),
+                 datetime(2019, 1, 2, 3, 4, 5, 678901, tzinfo=pytz.UTC),
+                 pytz.timezone('Europe/Paris').localize(datetime(2019, 1, 2, 3, 4, 5))]
+        decoded = cbor.decode(cbor.encode(value))
+        self.assertEqual(decoded, value)
+        self.assertEqual(str(decoded[0]), '-12.3400')
+
+    def test_invalid(self):
+        for data in (b'', b'\xff', b'\x82\x01', b'\x01\x02', b'\x9f\x01', b'\xa1\x80\x01',
+                     b'\x5f\x61\x61\xff', b'\x1c', b'\x81' * 100000,
+                     # Dates and datetimes out of range
+                     unhexlify('c1 1b ffffffffffffffff'), unhexlify('c1 fb 7ff0000000000000'),
+                     unhexlify('d8 64 1b ffffffffffffffff'), unhexlify('d8 64 1a 7fffffff'),
+                     unhexlify('d9 03ec 6a 323031392d31332d3031')):
+            self.assertRaises(ValueError, cbor.decode, data)
+            self.assertRaises(ValueError, cbor.loads, data)
+
+
+class BinaryRepresentationTestCase(unittest.TestCase):
+
+    def make_app(self):
+        app = Flask(__name__)
+        api = flask_restful.Api(app)
+        api.representation('application/msgpack')(output_msgpack)
+        api.representation('application/cbor')(output_cbor)
+
+        record_fields = {
+            'id': fields.Integer,
+            'price': fields.Raw,
+            'created': fields.Raw,
+        }
+        record = {'id': 1, 'price': Decimal('9.99'), 'created': datetime(2019, 1, 2, tzinfo=pytz.UTC)}
+
+        class Record(flask_restful.Resource):
+            @flask_restful.marshal_with(record_fields)
+            def get(self):
+                return record
+
+        class Records(flask_restful.Resource):
+            @flask_restful.marshal_with(record_fields, envelope='records', stream=True)
+            def get(self):
+                return (record for _ in range(3))
+
+        api.add_resource(Record, '/record')
+        api.add_resource(Records, '/records')
+        return app, record
+
+    def test_msgpack(self):
+        app, record = self.make_app()
+        with app.test_client() as client:
+            resp = client.get('/record', headers={'Accept': 'application/msgpack'})
+            self.assertEqual(resp.headers['Content-Type'], 'application/msgpack')
+            self.assertEqual(msgpack.loads(resp.data), dict(record, price=u'9.99'))
+
+            resp = client.get('/records', headers={'Accept': 'application/msgpack'})
+            self.assertEqual(msgpack.loads(resp.data),
+                             {'records': [dict(record, price=u'9.99')] * 3})
+
+    def test_cbor(self):
+        app, record = self.make_app()
+        with app.test_client() as client:
+            resp = client.get('/record', headers={'Accept': 'application/cbor'})
+            self.assertEqual(resp.headers['Content-Type'], 'application/cbor')
+            self.assertEqual(cbor.loads(resp.data), record)
+
+            resp = client.get('/records', headers={'Accept': 'application/cbor'})
+            self.assertTrue(resp.is_streamed)
+            self.assertEqual(cbor.loads(resp.data), {'records': [record] * 3})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+import gzip
+import io
+import json
+import shutil
+import tempfile
+import time
+import unittest
+
+from flask import Flask
+import flask_restful
+from flask_restful import cache
+
+
+class MemoryCacheTestCase(unittest.TestCase):
+
+    def test_size_eviction(self):
+        backend = cache.MemoryCache(max_size=10)
+        backend.set('a', b'1234')
+        backend.set('b', b'1234')
+        self.assertEqual(backend.get('a'), b'1234')
+        backend.set('c', b'1234')
+        self.assertEqual(backend.get('b'), None)
+        self.assertEqual(backend.get('a'), b'1234')
+        self.assertEqual(backend.size, 8)
+
+        backend.set('d', b'12345678901')
+        self.assertEqual(backend.get('d'), None)
+        self.assertEqual(backend.size, 8)
+
+    def test_ttl_and_add(self):
+        backend = cache.MemoryCache()
+        backend.set('a', b'1', ttl=-1)
+        self.assertEqual(backend.get('a'), None)
+        self.assertTrue(backend.add('a', b'2'))
+        self.assertFalse(backend.add('a', b'3'))
+        self.assertEqual(backend.get('a'), b'2')
+        backend.delete('a')
+        self.assertEqual(backend.get('a'), None)
+        self.assertEqual(backend.size, 0)
+
+
+class FileCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_file_cache(self):
+        backend = cache.FileCache(self.directory)
+        backend.set('a', b'one\ntwo')
+        self.assertEqual(cache.FileCache(self.directory).get('a'), b'one\ntwo')
+
+        backend.set('b', b'1', ttl=-1)
+        self.assertEqual(backend.get('b'), None)
+        self.assertTrue(backend.add('b', b'2', ttl=60))
+        self.assertFalse(backend.add('b', b'3'))
+        self.assertEqual(backend.get('b'), b'2')
+
+        backend.delete('b')
+        backend.delete('b')
+        self.assertEqual(backend.get('b'), None)
+        backend.clear()
+        self.assertEqual(backend.get('a'), None)
+
+
+class CachedTestCase(unittest.TestCase):
+
+    def make_app(self, response_cache, **kwargs):
+        app = Flask(__name__)
+        api = flask_restful.Api(app, **kwargs)
+        calls = []
+
+        class Foo(flask_restful.Resource):
+            method_decorators = {'get': [cache.cached(ttl=60, vary=['Accept', 'Authorization'],
+                                                      cache=response_cache)]}
+
+            def get(self, id):
+                calls.append(id)
+                return {'id': id, 'calls': len(calls), 'padding': 'x' * 2048}
+
+            def put(self, id):
+                calls.append(id)
+                return {'id': id}
+
+        api.add_resource(Foo, '/foo/<int:id>')
+        return app, calls
+
+    def test_cached(self):
+        response_cache = cache.ResponseCache()
+        app, calls = self.make_app(response_cache)
+
+        with app.test_client() as client:
+            first = client.get('/foo/1')
+            self.assertEqual(client.get('/foo/1').data, first.data)
+            self.assertEqual(client.get('/foo/1').headers['Content-Type'], 'application/json')
+            self.assertEqual(calls, [1])
+
+            client.get('/foo/1?page=2')
+            client.get('/foo/2')
+            client.get('/foo/1', headers={'Authorization': 'someone'})
+            self.assertEqual(calls, [1, 1, 2, 1])
+
+            client.put('/foo/1')
+            client.put('/foo/1')
+            self.assertEqual(calls, [1, 1, 2, 1, 1, 1])
+
+            cache.invalidate('foo', cache=response_cache)
+            self.assertEqual(json.loads(client.get('/foo/1').data.decode())['calls'], 7)
+
+    def test_cached_compressed(self):
+        response_cache = cache.ResponseCache()
+        app, calls = self.make_app(response_cache, compression=True)
+
+        with app.test_client() as client:
+            for _ in range(2):
+                resp = client.get('/foo/1', headers={'Accept-Encoding': 'gzip'})
+                self.assertEqual(resp.headers['Content-Encoding'], 'gzip')
+                gzip.GzipFile(fileobj=io.BytesIO(resp.data)).read()
+
+                resp = client.get('/foo/1')
+                self.assertFalse('Content-Encoding' in resp.headers)
+            self.assertEqual(calls, [1, 1])
+
+    def test_cached_api_decorator(self):
+        response_cache = cache.ResponseCache(cache.FileCache(tempfile.mkdtemp()))
+        self.addCleanup(shutil.rmtree, response_cache.backend.directory)
+        app = Flask(__name__)
+        api = flask_restful.Api(app, decorators=[cache.cached(cache=response_cache)], etag=True)
+        calls = []
+
+        class Foo(flask_restful.Resource):
+            def get(self):
+                calls.append(1)
+                return {'foo': 'bar'}
+
+        api.add_resource(Foo, '/foo')
+
+        with app.test_client() as client:
+            etag = client.get('/foo').headers['ETag']
+            resp = client.get('/foo', headers={'If-None-Match': etag})
+            self.assertEqual(resp.status_code, 304)
+            self.assertEqual(calls, [1])
+
+    def test_stampede_lock_timeout(self):
+        response_cache = cache.ResponseCache(lock_timeout=0.05)
+        app, calls = self.make_app(response_cache)
+
+        with app.test_request_context('/foo/1'):
+            lock_key = response_cache._base_key() + ':lock'
+        response_cache.backend.add(lock_key, b'1', 60)
+
+        with app.test_client() as client:
+            start = time.time()
+            self.assertEqual(client.get('/foo/1').status_code, 200)
+            self.assertTrue(time.time() - start >= 0.05)
+            self.assertEqual(calls, [1])
+            self.assertEqual(response_cache.backend.get(lock_key), b'1')
+            client.get('/foo/1')
+            self.assertEqual(calls, [1])
+
+    def test_cached_view(self):
+        response_cache = cache.ResponseCache(lock_timeout=3)
+        app = Flask(__name__)
+        calls = []
+
+        @app.route('/hello')
+        @cache.cached(cache=response_cache)
+        def hello():
+            calls.append(1)
+            return 'hello'
+
+        with app.test_client() as client:
+            for _ in range(3):
+                start = time.time()
+                resp = client.get('/hello')
+                self.assertTrue(time.time() - start < 1)
+                self.assertEqual(resp.data, b'hello')
+            self.assertEqual(calls, [1])
+
+        with app.test_request_context('/hello'):
+            lock_key = response_cache._base_key() + ':lock'
+        self.assertEqual(response_cache.backend.get(lock_key), None)
+
+
+if __name__ == '__main__':
+    unittest.main()
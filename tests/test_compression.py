@@ -0,0 +1,163 @@
+import gzip
+import io
+import json
+import unittest
+import warnings
+import zlib
+
+from flask import Flask, make_response
+import flask_restful
+from flask_restful import fields
+from flask_restful.compression import Compression
+
+
+def gunzip(data):
+    return gzip.GzipFile(fileobj=io.BytesIO(data)).read()
+
+
+class CompressionTestCase(unittest.TestCase):
+
+    def make_app(self, compression=True):
+        app = Flask(__name__)
+        api = flask_restful.Api(app, compression=compression)
+
+        class Big(flask_restful.Resource):
+            def get(self):
+                return [{'id': i, 'name': 'record %d' % i} for i in range(200)]
+
+        class Small(flask_restful.Resource):
+            def get(self):
+                return {'id': 1}
+
+        class Stream(flask_restful.Resource):
+            @flask_restful.marshal_with({'id': fields.Integer}, stream=True)
+            def get(self):
+                return ({'id': i} for i in range(5000))
+
+        api.add_resource(Big, '/big')
+        api.add_resource(Small, '/small')
+        api.add_resource(Stream, '/stream')
+        return app, api
+
+    def test_gzip(self):
+        app, api = self.make_app()
+        with app.test_client() as client:
+            resp = client.get('/big', headers={'Accept-Encoding': 'gzip, deflate'})
+            self.assertEqual(resp.headers['Content-Encoding'], 'gzip')
+            self.assertEqual(resp.headers['Vary'], 'Accept-Encoding')
+            self.assertEqual(int(resp.headers['Content-Length']), len(resp.data))
+            self.assertEqual(len(json.loads(gunzip(resp.data).decode())), 200)
+
+            resp = client.get('/big', headers={'Accept-Encoding': 'gzip;q=0.5, deflate'})
+            self.assertEqual(resp.headers['Content-Encoding'], 'deflate')
+            self.assertEqual(len(json.loads(zlib.decompress(resp.data).decode())), 200)
+
+        metrics = api.compression.metrics()
+        self.assertEqual(metrics['gzip']['responses'], 1)
+        self.assertTrue(metrics['gzip']['ratio'] > 1)
+        self.assertEqual(metrics['gzip']['level'], None)
+
+    def test_not_compressed(self):
+        app, api = self.make_app()
+        with app.test_client() as client:
+            resp = client.get('/big')
+            self.assertFalse('Content-Encoding' in resp.headers)
+            self.assertEqual(resp.headers['Vary'], 'Accept-Encoding')
+
+            resp = client.get('/big', headers={'Accept-Encoding': 'identity'})
+            self.assertFalse('Content-Encoding' in resp.headers)
+
+            resp = client.get('/small', headers={'Accept-Encoding': 'gzip'})
+            self.assertFalse('Content-Encoding' in resp.headers)
+            self.assertEqual(json.loads(resp.data.decode()), {'id': 1})
+
+        app, api = self.make_app(Compression(mediatypes=['text/csv']))
+        with app.test_client() as client:
+            resp = client.get('/big', headers={'Accept-Encoding': 'gzip'})
+            self.assertFalse('Content-Encoding' in resp.headers)
+            self.assertFalse('Vary' in resp.headers)
+
+        app, api = self.make_app(None)
+        with app.test_client() as client:
+            resp = client.get('/big', headers={'Accept-Encoding': 'gzip'})
+            self.assertFalse('Content-Encoding' in resp.headers)
+
+    def test_mediatype_threshold(self):
+        app, api = self.make_app(Compression(mediatypes={'application/json': 1024 * 1024}))
+        with app.test_client() as client:
+            resp = client.get('/big', headers={'Accept-Encoding': 'gzip'})
+            self.assertFalse('Content-Encoding' in resp.headers)
+            self.assertEqual(resp.headers['Vary'], 'Accept-Encoding')
+
+    def test_stream(self):
+        app, api = self.make_app()
+        with app.test_client() as client:
+            resp = client.get('/stream', headers={'Accept-Encoding': 'gzip'})
+            self.assertTrue(resp.is_streamed)
+            self.assertEqual(resp.headers['Content-Encoding'], 'gzip')
+            self.assertFalse('Content-Length' in resp.headers)
+            records = json.loads(gunzip(resp.data).decode())
+            self.assertEqual(len(records), 5000)
+
+        self.assertEqual(api.compression.metrics()['gzip']['responses'], 1)
+
+        app, api = self.make_app(Compression(stream=False))
+        with app.test_client() as client:
+            resp = client.get('/stream', headers={'Accept-Encoding': 'gzip'})
+            self.assertFalse('Content-Encoding' in resp.headers)
+            self.assertEqual(len(json.loads(resp.data.decode())), 5000)
+
+    def test_stream_chunks(self):
+        app = Flask(__name__)
+        api = flask_restful.Api(app, compression=True)
+        sent = []
+
+        def lines():
+            for i in range(3):
+                sent.append(i)
+                yield '{"id": %d}\n' % i
+
+        with app.test_request_context('/', headers={'Accept-Encoding': 'gzip'}):
+            resp = app.response_class(lines(), mimetype='application/x-ndjson')
+            resp = api.compression.compress(resp)
+            self.assertEqual(resp.headers['Content-Encoding'], 'gzip')
+
+            # Each chunk decompresses as soon as it is sent
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            chunks = iter(resp.response)
+            self.assertEqual(decompressor.decompress(next(chunks)), b'{"id": 0}\n')
+            self.assertEqual(sent, [0])
+            self.assertEqual(decompressor.decompress(next(chunks)), b'{"id": 1}\n')
+            self.assertEqual(sent, [0, 1])
+
+    def test_weak_etag(self):
+        app = Flask(__name__)
+        api = flask_restful.Api(app, compression=True)
+
+        with app.test_request_context('/', headers={'Accept-Encoding': 'gzip'}):
+            resp = make_response('x' * 2048)
+            resp.mimetype = 'text/plain'
+            resp.set_etag('abc')
+            resp = api.compression.compress(resp)
+            self.assertEqual(resp.headers['Content-Encoding'], 'gzip')
+            self.assertEqual(resp.get_etag(), ('abc', True))
+
+    def test_encodings(self):
+        self.assertRaises(ValueError, Compression, encodings=['lzma'])
+
+        compression = Compression(encodings=['deflate', 'gzip'], level={'gzip': 9})
+        self.assertEqual(compression.encodings, ['deflate', 'gzip'])
+        self.assertEqual(compression.metrics()['gzip']['level'], 9)
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            try:
+                import brotli  # noqa
+            except ImportError:
+                compression = Compression(encodings=['br', 'gzip'])
+                self.assertEqual(compression.encodings, ['gzip'])
+                self.assertEqual(len(caught), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
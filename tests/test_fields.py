@@ -383,6 +383,28 @@ class FieldsTestCase(unittest.TestCase):
         field = fields.DateTime(dt_format='raw')
         self.assertRaises(MarshallingException, lambda: field.output('bar', obj))
 
+    def test_datetime_format_changed(self):
+        obj = {"bar": datetime(2011, 8, 22, 20, 58, 45)}
+        field = fields.DateTime()
+        field.dt_format = 'iso8601'
+        self.assertEqual("2011-08-22T20:58:45", field.output("bar", obj))
+        field.dt_format = 'raw'
+        self.assertRaises(MarshallingException, lambda: field.output('bar', obj))
+
+    def test_datetime_cache(self):
+        utc = datetime(2011, 8, 22, 19, 58, 45, tzinfo=pytz.utc)
+        cet = pytz.timezone('CET').localize(datetime(2011, 8, 22, 21, 58, 45))
+        field = fields.DateTime(dt_format='iso8601', cache_size=2)
+        for _ in range(2):
+            self.assertEqual("2011-08-22T19:58:45+00:00", field.format(utc))
+            self.assertEqual("2011-08-22T21:58:45+02:00", field.format(cet))
+            self.assertEqual("2011-08-22", field.format(utc.date()))
+        self.assertRaises(MarshallingException, lambda: field.format([]))
+
+        field = fields.DateTime(cache_size=2)
+        self.assertEqual("Mon, 22 Aug 2011 19:58:45 -0000", field.format(cet))
+        self.assertEqual("Mon, 22 Aug 2011 19:58:45 -0000", field.format(utc))
+
     def test_to_dict(self):
         obj = {"hey": 3}
         self.assertEqual(obj, fields.to_marshallable_type(obj))
@@ -404,6 +426,39 @@ class FieldsTestCase(unittest.TestCase):
     def test_get_value_obj(self):
         self.assertEqual(3, fields.get_value("hey", Foo()))
 
+    def test_get_value_dotted(self):
+        obj = {"hey": {"foo": Foo(), "bar": {"you": 4}}}
+        self.assertEqual(3, fields.get_value("hey.foo.hey", obj))
+        self.assertEqual(4, fields.get_value("hey.bar.you", obj))
+        self.assertEqual(None, fields.get_value("hey.baz.you", obj))
+
+    def test_make_accessor(self):
+        obj = {"hey": {"foo": Foo(), "bar": {"you": 4}}, 0: "zero", "it": "strip"}
+        self.assertEqual(3, fields.make_accessor("hey.foo.hey")(obj))
+        self.assertEqual(4, fields.make_accessor("hey.bar.you")(obj))
+        self.assertEqual("zero", fields.make_accessor(0)(obj))
+        self.assertEqual("s", fields.make_accessor("it.0")(obj, "s"))
+        self.assertEqual(None, fields.make_accessor("hey.baz.you")(obj))
+        self.assertEqual("x", fields.make_accessor("nope")(obj, "x"))
+        self.assertEqual(3, fields.make_accessor(lambda o: o.hey)(Foo()))
+
+    def test_make_accessor_dynamic_attributes(self):
+        class Dynamic(object):
+            def __getattr__(self, name):
+                return name
+
+        self.assertEqual("hey", fields.make_accessor("hey")(Dynamic()))
+        self.assertEqual("you", fields.make_accessor("hey.you")({"hey": Dynamic()}))
+
+    def test_attribute_change_rebuilds_accessor(self):
+        field = fields.Raw(attribute="hey")
+        self.assertEqual(3, field.output("foo", {"hey": 3, "you": 4}))
+        field.attribute = "you"
+        self.assertEqual(4, field.output("foo", {"hey": 3, "you": 4}))
+        field.attribute = None
+        self.assertEqual(5, field.output("foo", {"foo": 5}))
+        self.assertEqual(6, field.output("bar", {"bar": 6}))
+
     def test_list(self):
         obj = {'list': ['a', 'b', 'c']}
         field = fields.List(fields.String)
@@ -499,6 +554,48 @@ class FieldsTestCase(unittest.TestCase):
         field = fields.List(fields.Raw)
         self.assertEqual([1, 2, 'a'], field.output('list', obj))
 
+    def test_builtin_fields_use_slots(self):
+        builtin = [fields.Raw(), fields.String(), fields.Integer(), fields.Boolean(),
+                   fields.Float(), fields.Arbitrary(), fields.DateTime(), fields.Fixed(),
+                   fields.Url('foo'), fields.FormattedString('{foo}'),
+                   fields.List(fields.String), fields.Nested({'foo': fields.Raw})]
+        for field in builtin:
+            self.assertFalse(hasattr(field, '__dict__'), type(field).__name__)
+
+        class Upper(fields.String):
+            def __init__(self, **kwargs):
+                super(Upper, self).__init__(**kwargs)
+                self.description = 'upper'
+
+            def format(self, value):
+                return value.upper()
+
+        field = Upper(attribute='hey')
+        self.assertEqual('upper', field.description)
+        self.assertEqual('YOU', field.output('foo', {'hey': 'you'}))
+
+    def test_custom_field_without_init(self):
+        class Upper(fields.Raw):
+            def __init__(self, attribute=None):
+                self.attribute = attribute
+                self.default = None
+
+            def format(self, value):
+                return value.upper()
+
+        class Lower(fields.Raw):
+            attribute = 'hey'
+
+            def __init__(self):
+                self.default = None
+
+            def format(self, value):
+                return value.lower()
+
+        self.assertEqual('YOU', Upper().output('foo', {'foo': 'you'}))
+        self.assertEqual('YOU', Upper('hey').output('foo', {'hey': 'you'}))
+        self.assertEqual('you', Lower().output('foo', {'hey': 'YOU'}))
+
 
 if __name__ == '__main__':
     unittest.main()
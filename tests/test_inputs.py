@@ -1,5 +1,7 @@
+from copy import deepcopy
 from datetime import datetime, timedelta, tzinfo
 import unittest
+import aniso8601
 import pytz
 import re
 
@@ -33,6 +35,35 @@ def test_reverse_iso8601_datetime():
         yield assert_equal, inputs.datetime_from_iso8601(date_string), expected
 
 
+def check_iso8601_datetime_as_aniso8601(date_string):
+    try:
+        expected = aniso8601.parse_datetime(date_string)
+    except ValueError:
+        assert_raises(ValueError, inputs.datetime_from_iso8601, date_string)
+        return
+    parsed = inputs.datetime_from_iso8601(date_string)
+    assert_equal(parsed, expected)
+    assert_equal(parsed.utcoffset(), expected.utcoffset())
+
+
+def test_reverse_iso8601_datetime_as_aniso8601():
+    date_strings = [
+        "2012-01-01T23:30",
+        "2012-01-01T23:30:00.5Z",
+        "2012-01-01T23:30:00,123456789-0530",
+        "2012-01-01T23+01",
+        "20120101T2330",
+        "2012-01-01T24:00",
+        "2012-01-01",
+        "2012-01-01T23:30-00:00",
+        "2012-01-01T23:30+05:60",
+        "2012-02-30T23:30",
+    ]
+
+    for date_string in date_strings:
+        yield check_iso8601_datetime_as_aniso8601, date_string
+
+
 def test_urls():
     urls = [
         'http://www.djangoproject.com/',
@@ -165,6 +196,15 @@ def test_regex_flags_bad_input():
         yield assert_raises, ValueError, lambda: case_sensitive(value)
 
 
+def test_regex_deepcopy():
+    case_insensitive = inputs.regex(r'^[A-Z]+$', re.IGNORECASE)
+    copied = deepcopy(case_insensitive)
+
+    assert copied is not case_insensitive
+    assert copied.re is case_insensitive.re
+    assert_equal(copied('abc'), 'abc')
+
+
 class TypesTestCase(unittest.TestCase):
 
     def test_boolean_false(self):
@@ -422,5 +462,54 @@ def test_bad_isointervals():
             bad_interval,
         )
 
+
+def _aniso8601_interval(value):
+    start, end = inputs._parse_interval(value)
+    if end is None:
+        end = inputs._expand_datetime(start, value)
+    return inputs._normalize_interval(start, end, value)
+
+
+def test_isointerval_fast_path_matches_aniso8601():
+    values = [
+        '2013-01-01',
+        '2012-02-29T23',
+        '2013-01-01T12:30Z',
+        '2013-01-01T12:30:15.123456789+05:30',
+        '2013-01-01T12:30:15,5-0800',
+        '2013-01-01/2013-02-28',
+        '2013-02-28/2013-01-01',
+        '2013-01-01T06:00Z/2013-01-01T12:00+01',
+        '2013-01-01/P3D',
+        '2013-01-01/P2W',
+        '2013-01-01T12:00/PT1H30M15S',
+    ]
+
+    for value in values:
+        assert inputs._parse_interval_fast(value) is not None, value
+        yield assert_equal, inputs.iso8601interval(value), _aniso8601_interval(value)
+
+
+def test_isointerval_fallback_forms():
+    values = [
+        '20130101T1230',
+        '2013-01-01T24:00',
+        '2013-01-01/P1M',
+        '2013-01-01T12:00:00/PT1.5S',
+        'P1D/2013-01-02',
+    ]
+
+    for value in values:
+        assert inputs._parse_interval_fast(value) is None, value
+        yield assert_equal, inputs.iso8601interval(value), _aniso8601_interval(value)
+
+
+def test_isointerval_cached():
+    value = '2014-03-04T05:06/PT7M'
+    inputs._interval_cache.clear()
+    interval = inputs.iso8601interval(value)
+    assert value in inputs._interval_cache
+    assert inputs.iso8601interval(value) is interval
+
 if __name__ == '__main__':
     unittest.main()
@@ -6,9 +6,15 @@ from werkzeug import exceptions
 from werkzeug.wrappers import Request
 from werkzeug.datastructures import FileStorage, MultiDict
 from flask_restful.reqparse import Argument, RequestParser, Namespace
+from flask_restful.representations import cbor, msgpack
 import six
 import decimal
 
+try:
+    import enum
+except ImportError:
+    enum = None
+
 import json
 
 
@@ -264,6 +270,36 @@ class ReqParseTestCase(unittest.TestCase):
             args = parser.parse_args()
             self.assertEqual(args['foo'], 'bar')
 
+    def test_get_binary_location(self):
+        app = Flask(__name__)
+
+        parser = RequestParser()
+        parser.add_argument("foo", location="msgpack")
+        parser.add_argument("bar", type=int, location=["cbor", "args"])
+
+        with app.test_request_context('/bubble?bar=1', method="post",
+                                      data=msgpack.dumps({"foo": "bar"}),
+                                      content_type='application/msgpack'):
+            args = parser.parse_args()
+            self.assertEqual(args['foo'], 'bar')
+            self.assertEqual(args['bar'], 1)
+
+        with app.test_request_context('/bubble?bar=1', method="post",
+                                      data=cbor.dumps({"bar": 2}),
+                                      content_type='application/cbor'):
+            args = parser.parse_args()
+            self.assertEqual(args['foo'], None)
+            self.assertEqual(args['bar'], 2)
+
+        with app.test_request_context('/bubble', method="post", data=b'\xc1',
+                                      content_type='application/msgpack'):
+            self.assertRaises(exceptions.BadRequest, parser.parse_args)
+
+        with app.test_request_context('/bubble', method="post",
+                                      data=b'\xa1\x61\x61\xc1\x1b' + b'\xff' * 8,
+                                      content_type='application/cbor'):
+            self.assertRaises(exceptions.BadRequest, parser.parse_args)
+
     def test_parse_append_ignore(self):
         req = Request.from_values("/bubble?foo=bar")
 
@@ -583,6 +619,22 @@ class ReqParseTestCase(unittest.TestCase):
 
         args = parser.parse_args(req)
         self.assertEqual('bat', args.get('foo'))
+        self.assertEqual(parser.args[0].choices, ["BAT"])
+
+    def test_is_choice(self):
+        arg = Argument("foo", choices=["BAT", 1, ["list"]])
+        self.assertTrue(arg.is_choice("BAT"))
+        self.assertFalse(arg.is_choice("bat"))
+        self.assertTrue(arg.is_choice(1))
+        self.assertTrue(arg.is_choice(["list"]))
+
+        arg.case_sensitive = False
+        self.assertTrue(arg.is_choice("bat"))
+        self.assertFalse(arg.is_choice("BAT"))
+
+        arg.choices = range(1000)
+        self.assertTrue(arg.is_choice(999))
+        self.assertFalse(arg.is_choice(1000))
 
     def test_parse_ignore(self):
         req = Request.from_values("/bubble?foo=bar")
@@ -635,6 +687,50 @@ class ReqParseTestCase(unittest.TestCase):
         args = parser.parse_args(req)
         self.assertEqual(args['foo'], "1")
 
+    def test_type_callable_arity(self):
+        calls = []
+
+        def one(value):
+            calls.append((value,))
+            return value
+
+        def two(value, name):
+            calls.append((value, name))
+            return value
+
+        def three(value, name, op='='):
+            calls.append((value, name, op))
+            return value
+
+        def raises(value):
+            calls.append((value,))
+            raise TypeError('not a foo')
+
+        for converter, expected in ((one, ('1',)), (two, ('1', 'foo')),
+                                    (three, ('1', 'foo', '='))):
+            del calls[:]
+            arg = Argument('foo', type=converter)
+            self.assertEqual(arg.convert('1', '='), '1')
+            self.assertEqual(calls, [expected])
+
+        del calls[:]
+        arg = Argument('foo', type=raises)
+        self.assertRaises(TypeError, arg.convert, '1', '=')
+        self.assertEqual(calls, [('1',)])
+
+        arg.type = int
+        self.assertEqual(arg.convert('1', '='), 1)
+
+    @unittest.skipIf(enum is None, 'enum is not available')
+    def test_type_enum(self):
+        Color = enum.Enum('Color', [('red', 'red'), ('blue', 'blue')])
+
+        parser = RequestParser()
+        parser.add_argument('c', type=Color)
+
+        args = parser.parse_args(Request.from_values('/bubble?c=red'))
+        self.assertEqual(args['c'], Color.red)
+
     def test_type_callable_none(self):
         app = Flask(__name__)
 
@@ -770,6 +866,40 @@ class ReqParseTestCase(unittest.TestCase):
         self.assertEqual(args['foo'], 101)
         self.assertEqual(args['bar'], u'baz')
 
+    def test_request_parser_copy_shares_values(self):
+        parser = RequestParser()
+        parser.add_argument('foo', type=int, choices=[1, 2])
+        parser_copy = parser.copy()
+
+        self.assertTrue(parser_copy.args[0] is not parser.args[0])
+        self.assertTrue(parser_copy.args[0].choices is parser.args[0].choices)
+
+        parser_copy.args[0].required = True
+        self.assertFalse(parser.args[0].required)
+
+    def test_argument_and_namespace_use_slots(self):
+        arg = Argument('foo', type=int, choices=[1, 2])
+        self.assertFalse(hasattr(arg, '__dict__'))
+        self.assertTrue(arg.is_choice(2))
+        self.assertFalse(hasattr(Namespace(), '__dict__'))
+
+        namespace = Namespace(foo=1)
+        namespace.bar = 2
+        self.assertEqual(namespace, {'foo': 1, 'bar': 2})
+
+    def test_argument_subclass_without_init(self):
+        class IntArgument(Argument):
+            def __init__(self, name, choices):
+                self.name = name
+                self.type = int
+                self.choices = choices
+                self.case_sensitive = True
+
+        arg = IntArgument('foo', [1, 2])
+        self.assertTrue(arg.is_choice(2))
+        self.assertFalse(arg.is_choice(3))
+        self.assertEqual(arg.convert('1', '='), 1)
+
     def test_request_parse_copy_including_settings(self):
         parser = RequestParser(trim=True, bundle_errors=True)
         parser_copy = parser.copy()
@@ -801,6 +931,101 @@ class ReqParseTestCase(unittest.TestCase):
             self.assertEqual(args['foo'], 1)
             self.assertEqual(args['baz'], 2)
 
+    def test_source_shared_by_location(self):
+        req = Request.from_values("/bubble?foo=1&bar=2&baz=3")
+        parser = RequestParser()
+        parser.add_argument('foo', type=int)
+        parser.add_argument('bar', type=int)
+        parser.add_argument('baz', type=int, location='args')
+
+        with patch.object(Argument, 'source', autospec=True,
+                          side_effect=lambda arg, req: req.args) as source:
+            args = parser.parse_args(req)
+        self.assertEqual(args, {'foo': 1, 'bar': 2, 'baz': 3})
+        self.assertEqual(source.call_count, 2)
+
+        parser.args[-1].location = 'values'
+        parser.add_argument('qux', location='args')
+        self.assertEqual(len(parser.compile()), 4)
+        args = parser.parse_args(req)
+        self.assertEqual(args, {'foo': 1, 'bar': 2, 'baz': 3, 'qux': None})
+
+    def test_source_shared_by_parsers(self):
+        app = Flask(__name__)
+        pagination = RequestParser()
+        pagination.add_argument('page', type=int)
+        filters = RequestParser()
+        filters.add_argument('name')
+
+        with patch.object(Argument, 'source', autospec=True,
+                          side_effect=lambda arg, req: req.values) as source:
+            for page in ('1', '2'):
+                with app.test_request_context('/bubble?page=%s&name=foo' % page):
+                    self.assertEqual(pagination.parse_args(), {'page': int(page)})
+                    self.assertEqual(filters.parse_args(), {'name': 'foo'})
+        self.assertEqual(source.call_count, 2)
+
+    def test_parse_many(self):
+        app = Flask(__name__)
+        parser = RequestParser()
+        parser.add_argument('foo', type=int, required=True)
+        parser.add_argument('bar', choices=('a', 'b'), location='args')
+
+        records = [{'foo': 1}, {'foo': '2', 'bar': 'b'}]
+        with app.test_request_context('/bubble', method='post',
+                                      data=json.dumps(records),
+                                      content_type='application/json'):
+            args = parser.parse_many()
+        self.assertEqual(args, [{'foo': 1, 'bar': None}, {'foo': 2, 'bar': 'b'}])
+
+    def test_parse_many_argument_class(self):
+        app = Flask(__name__)
+
+        class UpperArgument(Argument):
+            def convert(self, value, op):
+                return super(UpperArgument, self).convert(value, op).upper()
+
+        class LegacyArgument(Argument):
+            def parse(self, request, bundle_errors=False):
+                return super(LegacyArgument, self).parse(request, bundle_errors)
+
+        records = [{'foo': 'a'}, {'foo': 'b'}]
+        with app.test_request_context('/bubble', method='post',
+                                      data=json.dumps(records),
+                                      content_type='application/json'):
+            parser = RequestParser(argument_class=UpperArgument)
+            parser.add_argument('foo')
+            self.assertEqual(parser.parse_many(), [{'foo': 'A'}, {'foo': 'B'}])
+
+            parser = RequestParser(argument_class=LegacyArgument)
+            parser.add_argument('foo')
+            self.assertRaises(TypeError, parser.parse_many)
+
+    @patch('flask_restful.abort', side_effect=exceptions.BadRequest('Bad Request'))
+    def test_parse_many_errors(self, abort):
+        app = Flask(__name__)
+        parser = RequestParser()
+        parser.add_argument('foo', type=int, required=True)
+        parser.add_argument('bar', choices=('a', 'b'))
+
+        records = [{'foo': 1}, {'bar': 'c'}, 'foo', {'foo': 4, 'baz': 1}]
+        with app.test_request_context('/bubble', method='post',
+                                      data=json.dumps(records),
+                                      content_type='application/json'):
+            self.assertRaises(exceptions.BadRequest, parser.parse_many, strict=True)
+        abort.assert_called_with(400, message={
+            1: {'foo': 'Missing required parameter in the JSON body or the post body or the query string',
+                'bar': 'c is not a valid choice'},
+            2: 'Expected a JSON object',
+            3: {'baz': 'Unknown argument'},
+        })
+
+        with app.test_request_context('/bubble', method='post',
+                                      data=json.dumps({'foo': 1}),
+                                      content_type='application/json'):
+            self.assertRaises(exceptions.BadRequest, parser.parse_many, http_error_code=422)
+        abort.assert_called_with(422, message='Expected a JSON array of records')
+
     def test_not_json_location_and_content_type_json(self):
         app = Flask(__name__)
 